@@ -7,6 +7,8 @@ Provides analytics, version tracking, and template evolution insights
 
 import json
 import logging
+import os
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -21,6 +23,9 @@ tracker_module = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(tracker_module)
 
 class TemplateLineageManager:
+    # Fold the events log into the JSON snapshots after this many appended events
+    COMPACT_EVERY = 50
+    
     def __init__(self, base_path=None):
         self.base_path = Path(base_path) if base_path else Path(__file__).parent.parent
         self.systems_dir = self.base_path / "systems"
@@ -29,10 +34,20 @@ class TemplateLineageManager:
         self.lineage_file = self.systems_dir / "template-lineage.json"
         self.evolution_file = self.systems_dir / "template-evolution.json"
         self.analytics_file = self.systems_dir / "template-analytics.json"
+        self.events_log = self.systems_dir / "template-lineage.events.jsonl"
+        
+        # Snapshot rewrite flags and events queued for the log, flushed once per tracking event
+        self._dirty_lineage = False
+        self._dirty_evolution = False
+        self._pending_events = []
+        self._logged_events = 0
+        self._log_f = None
         
         # Load existing data
         self.load_lineage_data()
         self.load_evolution_data()
+        self.replay_events_log()
+        self.build_project_index()
         
         # Setup logging
         self.setup_logging()
@@ -41,16 +56,18 @@ class TemplateLineageManager:
     
     def setup_logging(self):
         """Setup lineage tracking logging"""
-        log_file = self.systems_dir / "template-lineage.log"
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
+        # basicConfig is process-global; only build (and open) handlers once
+        if not logging.getLogger().handlers:
+            log_file = self.systems_dir / "template-lineage.log"
+            
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(levelname)s - %(message)s',
+                handlers=[
+                    logging.FileHandler(log_file),
+                    logging.StreamHandler()
+                ]
+            )
         self.logger = logging.getLogger(__name__)
     
     def load_lineage_data(self):
@@ -65,6 +82,33 @@ class TemplateLineageManager:
                 "last_updated": datetime.now().isoformat()
             }
     
+    def build_project_index(self):
+        """Index generations by project path, each list sorted by generation time"""
+        by_project = defaultdict(list)
+        for gen_id, gen_data in self.lineage["generated_files"].items():
+            self.intern_generation(gen_data)
+            gen_data["id"] = gen_id
+            by_project[gen_data["project_path"]].append(gen_data)
+        
+        for generations in by_project.values():
+            generations.sort(key=lambda x: x["generated_at"])
+        
+        self.by_project = dict(by_project)
+    
+    @staticmethod
+    def intern_generation(gen_data: Dict) -> Dict:
+        """Share one string object per distinct project path, type, version and template"""
+        for key in ("project_path", "project_type", "generator_version"):
+            value = gen_data.get(key)
+            if isinstance(value, str):
+                gen_data[key] = sys.intern(value)
+        
+        templates = gen_data.get("templates")
+        if templates:
+            gen_data["templates"] = [sys.intern(t) for t in templates]
+        
+        return gen_data
+    
     def load_evolution_data(self):
         """Load template evolution tracking"""
         if self.evolution_file.exists():
@@ -78,17 +122,97 @@ class TemplateLineageManager:
                 "last_updated": datetime.now().isoformat()
             }
     
-    def save_lineage_data(self):
+    def replay_events_log(self):
+        """Apply events appended to the log since the last snapshot compaction"""
+        self._logged_events = 0
+        if not self.events_log.exists():
+            return
+        
+        generated_files = self.lineage["generated_files"]
+        snapshot_ids = set(generated_files)
+        # A crash between the two snapshot saves in compact() leaves changes in the
+        # evolution snapshot whose generations are missing from the lineage snapshot
+        changed_ids = {change["generation_id"] for change in self.evolution["changes"]}
+        
+        with open(self.events_log, 'r') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn trailing line from an interrupted append
+                    continue
+                
+                self._logged_events += 1
+                
+                # Events for generations already in the snapshot were compacted
+                # before the log could be truncated
+                if event.get("event") == "generation":
+                    record = event["record"]
+                    if record["id"] not in snapshot_ids:
+                        generated_files[record["id"]] = record
+                elif event.get("event") == "change":
+                    change = event["change"]
+                    if change["generation_id"] not in snapshot_ids and change["generation_id"] not in changed_ids:
+                        changed_ids.add(change["generation_id"])
+                        self.evolution["changes"].append(change)
+    
+    def write_json_atomic(self, path: Path, data: Dict, pretty: bool = False):
+        """Write JSON to a temp file and swap it in so readers never see a torn file
+        
+        Lineage stores are written compactly; set TEMPLATE_LINEAGE_PRETTY=1 to
+        indent them for manual inspection.
+        """
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            if pretty or os.environ.get("TEMPLATE_LINEAGE_PRETTY"):
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    
+    def save_lineage_data(self, now_iso: Optional[str] = None):
         """Save lineage data"""
-        self.lineage["last_updated"] = datetime.now().isoformat()
-        with open(self.lineage_file, 'w') as f:
-            json.dump(self.lineage, f, indent=2)
+        self.lineage["last_updated"] = now_iso or datetime.now().isoformat()
+        self.write_json_atomic(self.lineage_file, self.lineage)
+        self._dirty_lineage = False
     
-    def save_evolution_data(self):
+    def save_evolution_data(self, now_iso: Optional[str] = None):
         """Save evolution data"""
-        self.evolution["last_updated"] = datetime.now().isoformat()
-        with open(self.evolution_file, 'w') as f:
-            json.dump(self.evolution, f, indent=2)
+        self.evolution["last_updated"] = now_iso or datetime.now().isoformat()
+        self.write_json_atomic(self.evolution_file, self.evolution)
+        self._dirty_evolution = False
+    
+    def flush_if_dirty(self, now_iso: Optional[str] = None):
+        """Append queued events to the log, compacting when a snapshot rewrite is due"""
+        if self._pending_events:
+            if self._log_f is None:
+                # Large buffer so a tracking event's lines reach the kernel in one write
+                self._log_f = open(self.events_log, 'ab', buffering=64 * 1024)
+            for event in self._pending_events:
+                self._log_f.write(json.dumps(event, separators=(',', ':')).encode() + b"\n")
+            self._log_f.flush()
+            self._logged_events += len(self._pending_events)
+            self._pending_events = []
+        
+        if self._dirty_lineage or self._dirty_evolution or self._logged_events >= self.COMPACT_EVERY:
+            self.compact(now_iso)
+    
+    def compact(self, now_iso: Optional[str] = None):
+        """Rewrite both snapshots from memory and truncate the events log"""
+        # Evolution goes first so a generation in the lineage snapshot always has its changes saved
+        self.save_evolution_data(now_iso)
+        self.save_lineage_data(now_iso)
+        
+        self.close_events_log()
+        if self.events_log.exists():
+            self.events_log.unlink()
+        self._logged_events = 0
+    
+    def close_events_log(self):
+        """Close the events log handle if one is open"""
+        if self._log_f is not None:
+            self._log_f.close()
+            self._log_f = None
     
     def calculate_file_hash(self, file_path: Path) -> str:
         """Calculate hash of file for change detection"""
@@ -96,8 +220,12 @@ class TemplateLineageManager:
             return ""
         
         try:
-            content = file_path.read_text(encoding='utf-8')
-            return hashlib.md5(content.encode()).hexdigest()
+            # Hash raw bytes in chunks; no decode/encode round-trip
+            file_hash = hashlib.md5()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    file_hash.update(chunk)
+            return file_hash.hexdigest()
         except Exception:
             return ""
     
@@ -106,9 +234,18 @@ class TemplateLineageManager:
                                  generator_version: str = "1.0.0") -> str:
         """Track a new template generation event"""
         
-        # Create unique generation ID
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        generation_id = f"{project_path.name}_{timestamp}"
+        # Sample the clock once for the ID, the record and the save stamp
+        now = datetime.now()
+        now_iso = now.isoformat()
+        
+        # Create unique generation ID; the timestamp has one-second resolution,
+        # so repeat generations within a second get a numeric suffix
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
+        generation_id = base_id = f"{project_path.name}_{timestamp}"
+        suffix = 1
+        while generation_id in self.lineage["generated_files"]:
+            suffix += 1
+            generation_id = f"{base_id}_{suffix}"
         
         # Calculate file hashes for generated files
         file_hashes = {}
@@ -121,7 +258,7 @@ class TemplateLineageManager:
         generation_record = {
             "project_path": str(project_path),
             "project_type": project_type,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": now_iso,
             "files": generated_files,
             "templates": templates_used,
             "generator_version": generator_version,
@@ -130,33 +267,30 @@ class TemplateLineageManager:
         }
         
         # Check if this is an update to existing templates
-        existing_generations = self.find_existing_generations(project_path)
+        existing_generations = self.by_project.setdefault(generation_record["project_path"], [])
         if existing_generations:
-            latest_generation = max(existing_generations, key=lambda x: x["generated_at"])
+            latest_generation = existing_generations[-1]
             generation_record["parent_generation"] = latest_generation["id"]
             self.track_template_evolution(generation_id, latest_generation["id"], generation_record)
         
+        # Timestamps are monotonic, so appending keeps the project list sorted
+        self.intern_generation(generation_record)
+        generation_record["id"] = generation_id
+        existing_generations.append(generation_record)
         self.lineage["generated_files"][generation_id] = generation_record
-        self.save_lineage_data()
+        self._pending_events.append({"event": "generation", "record": generation_record})
+        self.flush_if_dirty(now_iso)
         
         # Track token usage for lineage tracking
         tracker_module.track_operation("template_lineage_tracking", 5)
         
-        self.logger.info(f"Tracked template generation: {generation_id}")
+        self.logger.info("Tracked template generation: %s", generation_id)
         
         return generation_id
     
     def find_existing_generations(self, project_path: Path) -> List[Dict]:
-        """Find existing template generations for a project"""
-        project_path_str = str(project_path)
-        existing = []
-        
-        for gen_id, gen_data in self.lineage["generated_files"].items():
-            if gen_data["project_path"] == project_path_str:
-                gen_data["id"] = gen_id
-                existing.append(gen_data)
-        
-        return existing
+        """Find existing template generations for a project, oldest first"""
+        return list(self.by_project.get(str(project_path), []))
     
     def track_template_evolution(self, new_generation_id: str, parent_generation_id: str, new_generation: Dict):
         """Track changes between template generations"""
@@ -169,7 +303,7 @@ class TemplateLineageManager:
         changes = {
             "generation_id": new_generation_id,
             "parent_id": parent_generation_id,
-            "changed_at": datetime.now().isoformat(),
+            "changed_at": new_generation.get("generated_at") or datetime.now().isoformat(),
             "changes": []
         }
         
@@ -196,21 +330,22 @@ class TemplateLineageManager:
         parent_templates = set(parent_generation.get("templates", []))
         new_templates = set(new_generation.get("templates", []))
         
-        if parent_templates != new_templates:
+        added_templates = new_templates - parent_templates
+        removed_templates = parent_templates - new_templates
+        
+        if added_templates or removed_templates:
             changes["changes"].append({
                 "type": "templates_changed",
-                "added": list(new_templates - parent_templates),
-                "removed": list(parent_templates - new_templates)
+                "added": list(added_templates),
+                "removed": list(removed_templates)
             })
         
         # Check for file content changes using hashes
         parent_hashes = parent_generation.get("file_hashes", {})
         new_hashes = new_generation.get("file_hashes", {})
         
-        modified_files = []
-        for file_path, new_hash in new_hashes.items():
-            if file_path in parent_hashes and parent_hashes[file_path] != new_hash:
-                modified_files.append(file_path)
+        common_files = new_hashes.keys() & parent_hashes.keys()
+        modified_files = [p for p in common_files if parent_hashes[p] != new_hashes[p]]
         
         if modified_files:
             changes["changes"].append({
@@ -228,8 +363,8 @@ class TemplateLineageManager:
         
         if changes["changes"]:
             self.evolution["changes"].append(changes)
-            self.save_evolution_data()
-            self.logger.info(f"Tracked {len(changes['changes'])} template changes for {new_generation_id}")
+            self._pending_events.append({"event": "change", "change": changes})
+            self.logger.info("Tracked %d template changes for %s", len(changes["changes"]), new_generation_id)
     
     def get_project_template_history(self, project_path: Path) -> Dict:
         """Get complete template history for a project"""
@@ -238,9 +373,7 @@ class TemplateLineageManager:
         if not project_generations:
             return {"error": "No template generations found for project"}
         
-        # Sort by generation time
-        project_generations.sort(key=lambda x: x["generated_at"])
-        
+        # Generations come back already sorted by generation time
         history = {
             "project_path": str(project_path),
             "total_generations": len(project_generations),
@@ -278,28 +411,32 @@ class TemplateLineageManager:
         }
         
         # Analyze template usage
+        project_types = Counter()
+        template_types = Counter()
+        generator_versions = Counter()
         for generation in self.lineage["generated_files"].values():
             # Count project types
-            project_type = generation.get("project_type", "unknown")
-            analytics["summary"]["project_types"][project_type] = analytics["summary"]["project_types"].get(project_type, 0) + 1
+            project_types[generation.get("project_type", "unknown")] += 1
             
             # Count template types
-            for template in generation.get("templates", []):
-                analytics["summary"]["template_types"][template] = analytics["summary"]["template_types"].get(template, 0) + 1
+            template_types.update(generation.get("templates", []))
             
             # Count generator versions
-            version = generation.get("generator_version", "unknown")
-            analytics["summary"]["generator_versions"][version] = analytics["summary"]["generator_versions"].get(version, 0) + 1
+            generator_versions[generation.get("generator_version", "unknown")] += 1
+        
+        analytics["summary"]["project_types"] = dict(project_types)
+        analytics["summary"]["template_types"] = dict(template_types)
+        analytics["summary"]["generator_versions"] = dict(generator_versions)
         
         # Analyze usage patterns
         analytics["usage_patterns"] = self.analyze_usage_patterns()
         
-        # Generate recommendations
-        analytics["recommendations"] = self.generate_lineage_recommendations(analytics)
+        # Generate recommendations (budget is read once per analytics pass)
+        budget_status = tracker_module.check_budget()
+        analytics["recommendations"] = self.generate_lineage_recommendations(analytics, budget_status)
         
         # Save analytics
-        with open(self.analytics_file, 'w') as f:
-            json.dump(analytics, f, indent=2)
+        self.write_json_atomic(self.analytics_file, analytics, pretty=True)
         
         return analytics
     
@@ -313,28 +450,28 @@ class TemplateLineageManager:
         }
         
         # Analyze template combinations
+        combinations = Counter()
         for generation in self.lineage["generated_files"].values():
             templates = sorted(generation.get("templates", []))
-            combination = "_".join(templates)
-            
-            patterns["most_common_combinations"][combination] = patterns["most_common_combinations"].get(combination, 0) + 1
+            combinations["_".join(templates)] += 1
+        patterns["most_common_combinations"] = dict(combinations)
         
         # Analyze file types generated
+        file_popularity = Counter()
         for generation in self.lineage["generated_files"].values():
             for file_path in generation.get("files", []):
-                file_name = Path(file_path).name
-                patterns["file_popularity"][file_name] = patterns["file_popularity"].get(file_name, 0) + 1
+                file_popularity[os.path.basename(file_path)] += 1
+        patterns["file_popularity"] = dict(file_popularity)
         
         # Analyze generation frequency by project type
+        generation_frequency = defaultdict(list)
         for generation in self.lineage["generated_files"].values():
-            project_type = generation.get("project_type", "unknown")
-            if project_type not in patterns["generation_frequency"]:
-                patterns["generation_frequency"][project_type] = []
-            patterns["generation_frequency"][project_type].append(generation["generated_at"])
+            generation_frequency[generation.get("project_type", "unknown")].append(generation["generated_at"])
+        patterns["generation_frequency"] = dict(generation_frequency)
         
         return patterns
     
-    def generate_lineage_recommendations(self, analytics: Dict) -> List[str]:
+    def generate_lineage_recommendations(self, analytics: Dict, budget_status: Optional[Dict] = None) -> List[str]:
         """Generate recommendations based on lineage analytics"""
         recommendations = []
         
@@ -360,7 +497,8 @@ class TemplateLineageManager:
             recommendations.append("Multiple generator versions detected - consider updating older projects")
         
         # Token usage recommendation
-        budget_status = tracker_module.check_budget()
+        if budget_status is None:
+            budget_status = tracker_module.check_budget()
         if budget_status["weekly"]["percentage"] > 80:
             recommendations.append("Template lineage tracking approaching token budget limit")
         
@@ -381,13 +519,9 @@ class TemplateLineageManager:
             "inheritance_chain": []
         }
         
-        # Index generations by ID
-        gen_lookup = {}
+        # Index generations by ID (ids are assigned by the project index)
         for gen in generations:
-            gen_id = f"{project_path.name}_{gen['generated_at'].replace(':', '').replace('-', '').split('.')[0]}"
-            gen["id"] = gen_id
-            gen_lookup[gen_id] = gen
-            tree["generations"][gen_id] = gen
+            tree["generations"][gen["id"]] = gen
         
         # Build inheritance chain
         for gen_id, gen_data in tree["generations"].items():
@@ -430,29 +564,18 @@ class TemplateLineageManager:
             "recommendations": []
         }
         
-        # Find projects with multiple generations
-        projects_with_history = {}
-        for gen_data in self.lineage["generated_files"].values():
-            project_path = gen_data["project_path"]
-            if project_path not in projects_with_history:
-                projects_with_history[project_path] = []
-            projects_with_history[project_path].append(gen_data)
-        
-        # Check each project for drift
-        for project_path, generations in projects_with_history.items():
+        # Check each project with multiple generations for drift
+        for project_path, generations in self.by_project.items():
             if len(generations) > 1:
-                # Sort by generation time
-                generations.sort(key=lambda x: x["generated_at"])
-                
-                # Compare first and latest generation
+                # Compare first and latest generation (index lists are sorted by time)
                 first_gen = generations[0]
                 latest_gen = generations[-1]
                 
                 drift_issues = []
                 
                 # Check for file differences
-                first_files = set(Path(f).name for f in first_gen.get("files", []))
-                latest_files = set(Path(f).name for f in latest_gen.get("files", []))
+                first_files = set(map(os.path.basename, first_gen.get("files", [])))
+                latest_files = set(map(os.path.basename, latest_gen.get("files", [])))
                 
                 if first_files != latest_files:
                     drift_issues.append({
@@ -491,13 +614,13 @@ class TemplateLineageManager:
         if drift_report["projects_with_drift"]:
             drift_report["recommendations"].append(f"Review {len(drift_report['projects_with_drift'])} projects with template drift")
             
-            common_drifts = {}
-            for project in drift_report["projects_with_drift"]:
-                for issue in project["drift_issues"]:
-                    issue_type = issue["type"]
-                    common_drifts[issue_type] = common_drifts.get(issue_type, 0) + 1
+            common_drifts = Counter(
+                issue["type"]
+                for project in drift_report["projects_with_drift"]
+                for issue in project["drift_issues"]
+            )
             
-            drift_report["common_drift_patterns"] = common_drifts
+            drift_report["common_drift_patterns"] = dict(common_drifts)
             
             if common_drifts.get("file_structure_drift", 0) > 2:
                 drift_report["recommendations"].append("Consider standardizing file structure across projects")
@@ -525,6 +648,8 @@ class TemplateLineageManager:
             if gen_data.get("generated_at", "") >= cutoff_iso
         }
         cleaned["generations_removed"] = original_gen_count - len(self.lineage["generated_files"])
+        if cleaned["generations_removed"] > 0:
+            self.build_project_index()
         
         # Clean old evolution changes
         original_change_count = len(self.evolution.get("changes", []))
@@ -534,10 +659,15 @@ class TemplateLineageManager:
         ]
         cleaned["changes_removed"] = original_change_count - len(self.evolution["changes"])
         
+        if cleaned["generations_removed"] > 0:
+            self._dirty_lineage = True
+        if cleaned["changes_removed"] > 0:
+            self._dirty_evolution = True
+        
         if cleaned["generations_removed"] > 0 or cleaned["changes_removed"] > 0:
-            self.save_lineage_data()
-            self.save_evolution_data()
-            self.logger.info(f"Cleaned {cleaned['generations_removed']} old generations and {cleaned['changes_removed']} old changes")
+            self.flush_if_dirty()
+            self.logger.info("Cleaned %d old generations and %d old changes",
+                             cleaned["generations_removed"], cleaned["changes_removed"])
         
         return cleaned
 
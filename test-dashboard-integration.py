@@ -5,15 +5,89 @@ Verifies that the dashboard can load and display real project data
 """
 
 import json
+import mmap
+import os
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+    
+    def load_json(f):
+        """Parse JSON from a binary file handle, mapping it instead of reading"""
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")  # mmap rejects empty files; raise the usual parse error
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+except ImportError:
+    def load_json(f):
+        """Parse JSON from a binary file handle"""
+        return json.load(f)
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import msgspec
+    from typing import Any, Dict
+    
+    class _ProjectSchema(msgspec.Struct):
+        """Project fields the dashboard JS reads; other fields are skipped"""
+        id: Any
+        title: Any
+        status: Any
+        progress: Any
+    
+    class _DashboardSchema(msgspec.Struct):
+        """Top-level dashboard layout checked by validate_dashboard_compatibility"""
+        projects: Dict[str, _ProjectSchema]
+        summary: Dict[str, Any]
+        token_status: Any
+        security_summary: Any
+except ImportError:
+    msgspec = None
+
+try:
+    import simdjson
+    JSON_OBJECT_TYPES = (dict, simdjson.Object)
+except ImportError:
+    simdjson = None
+    JSON_OBJECT_TYPES = (dict,)
+
+_HERE = Path(__file__).resolve().parent
+_DASHBOARD_FILE = _HERE.parent / "active" / "Project Management" / "dashboard" / "projects-data.json"
+
+# Fields the dashboard JS reads from every project
+_REQUIRED_PROJECT_FIELDS = frozenset({'id', 'title', 'status', 'progress'})
+
+# Full project record format and top-level keys checked by the integration test
+_PROJECT_FIELDS = frozenset({'id', 'title', 'status', 'progress', 'category', 'priority'})
+_TOP_LEVEL_KEYS = frozenset({'projects', 'summary', 'token_status', 'security_summary'})
+
+# Report line templates for the per-project loops
+_fmt_drilldown = "   ✅ {}: {} files, {} activities".format
+_fmt_drilldown_detail = "      Progress: {}%, Security: {}/100".format
+
 # Import dashboard data provider
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(_HERE))
+import functools
 import importlib.util
-spec = importlib.util.spec_from_file_location("provider", Path(__file__).parent / "dashboard-data-provider.py")
-provider_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(provider_module)
+
+@functools.lru_cache(maxsize=None)
+def _load_hyphenated(name, path):
+    """Load a module from a hyphenated file name, reusing it if already imported"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+provider_module = _load_hyphenated("provider", _HERE / "dashboard-data-provider.py")
 
 def test_dashboard_data_integration():
     """Test the complete dashboard data integration"""
@@ -26,72 +100,83 @@ def test_dashboard_data_integration():
     print("\n1. Testing Dashboard Data Generation:")
     dashboard_data = provider.get_dashboard_projects_data()
     
-    print(f"   ✅ Generated data for {dashboard_data['summary']['total_projects']} projects")
-    print(f"   ✅ Overall progress: {dashboard_data['summary']['overall_progress']}%")
+    summary = dashboard_data['summary']
+    weekly_tokens = dashboard_data['token_status']['weekly']
+    print(f"   ✅ Generated data for {summary['total_projects']} projects")
+    print(f"   ✅ Overall progress: {summary['overall_progress']}%")
     print(f"   ✅ Security score: {dashboard_data['security_summary']['overall_score']}/100")
-    print(f"   ✅ Token usage: {dashboard_data['token_status']['weekly']['used']}/{dashboard_data['token_status']['weekly']['budget']}")
+    print(f"   ✅ Token usage: {weekly_tokens['used']}/{weekly_tokens['budget']}")
     
     # Test 2: Project drilldown data
     print("\n2. Testing Project Drilldown:")
     test_projects = ['legiscraper', 'Personal-OS', 'scrapers']
     
+    # Collect report lines and write them in one go. Drilldowns stay sequential:
+    # they share the document parser cache and token tracker, which both save
+    # their JSON files without locking.
+    lines = []
+    projects = dashboard_data['projects']
     for project_id in test_projects:
-        if project_id in dashboard_data['projects']:
+        if project_id in projects:
             drilldown = provider.get_project_drilldown_data(project_id)
             
             if "error" not in drilldown:
-                print(f"   ✅ {project_id}: {len(drilldown['files'])} files, {len(drilldown['recent_activity'])} activities")
-                print(f"      Progress: {drilldown['documents']['summary']['overall_progress']}%, Security: {drilldown['security']['security_score']}/100")
+                docs_sum = drilldown['documents']['summary']
+                lines.append(_fmt_drilldown(project_id, len(drilldown['files']), len(drilldown['recent_activity'])))
+                lines.append(_fmt_drilldown_detail(docs_sum['overall_progress'],
+                                                   drilldown['security']['security_score']))
             else:
-                print(f"   ❌ {project_id}: {drilldown['error']}")
+                lines.append(f"   ❌ {project_id}: {drilldown['error']}")
         else:
-            print(f"   ⚠️  {project_id}: Not found in registry")
+            lines.append(f"   ⚠️  {project_id}: Not found in registry")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Test 3: Check dashboard file generation
     print("\n3. Testing Dashboard File Generation:")
     dashboard_data = provider.save_dashboard_data()
     
-    dashboard_file = Path(__file__).parent.parent / "active" / "Project Management" / "dashboard" / "projects-data.json"
-    
-    if dashboard_file.exists():
-        with open(dashboard_file, 'r') as f:
-            file_data = json.load(f)
-        
-        print(f"   ✅ Dashboard file created: {dashboard_file}")
+    try:
+        with open(_DASHBOARD_FILE, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            file_data = load_json(f)
+    except FileNotFoundError:
+        print("   ❌ Dashboard file not created")
+    else:
+        print(f"   ✅ Dashboard file created: {_DASHBOARD_FILE}")
         print(f"   ✅ Projects in file: {len(file_data.get('projects', {}))}")
-        print(f"   ✅ File size: {dashboard_file.stat().st_size} bytes")
+        print(f"   ✅ File size: {file_size} bytes")
         
         # Verify data structure
-        required_keys = ['projects', 'summary', 'token_status', 'security_summary']
-        missing_keys = [key for key in required_keys if key not in file_data]
+        missing_keys = _TOP_LEVEL_KEYS - file_data.keys()
         
         if not missing_keys:
             print("   ✅ All required data keys present")
         else:
-            print(f"   ❌ Missing keys: {missing_keys}")
-    else:
-        print("   ❌ Dashboard file not created")
+            print(f"   ❌ Missing keys: {sorted(missing_keys)}")
     
     # Test 4: Sample project data format
     print("\n4. Testing Project Data Format:")
     sample_projects = list(dashboard_data['projects'].items())[:3]
     
+    lines = []
     for project_id, project in sample_projects:
-        required_fields = ['id', 'title', 'status', 'progress', 'category', 'priority']
-        missing_fields = [field for field in required_fields if field not in project]
+        missing_fields = _PROJECT_FIELDS - project.keys()
         
         if not missing_fields:
-            print(f"   ✅ {project_id}: All required fields present")
+            lines.append(f"   ✅ {project_id}: All required fields present")
         else:
-            print(f"   ⚠️  {project_id}: Missing fields: {missing_fields}")
+            lines.append(f"   ⚠️  {project_id}: Missing fields: {sorted(missing_fields)}")
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # Test 5: Integration with token tracking
     print("\n5. Testing Token Tracking Integration:")
     provider.token_module.track_operation("dashboard_test", 30)
     budget_status = provider.token_module.check_budget()
     
-    print(f"   ✅ Token tracking active: {budget_status['weekly']['used']}/{budget_status['weekly']['budget']} weekly")
-    print(f"   ✅ Daily usage: {budget_status['daily']['used']:.1f}/{budget_status['daily']['budget']:.1f}")
+    weekly, daily = budget_status['weekly'], budget_status['daily']
+    print(f"   ✅ Token tracking active: {weekly['used']}/{weekly['budget']} weekly")
+    print(f"   ✅ Daily usage: {daily['used']:.1f}/{daily['budget']:.1f}")
     
     print("\n6. Dashboard Integration Summary:")
     print("   ✅ Real project data integration working")
@@ -100,28 +185,107 @@ def test_dashboard_data_integration():
     print("   ✅ Token tracking operational")
     print("   ✅ Dashboard files properly generated")
     
-    return True
+    # Hand back the saved data so validation can skip re-reading the file
+    return True, dashboard_data
 
-def validate_dashboard_compatibility():
-    """Validate that generated data is compatible with dashboard JS"""
-    print("\n🔧 Validating Dashboard Compatibility:")
+def load_dashboard_skeleton(path):
+    """Stream the dashboard file into a key-only skeleton
+    
+    Top-level objects become empty containers and each project keeps only its
+    field names, which is all the compatibility checks look at.
+    """
+    skeleton = {}
+    depth = 0
+    top_key = project = None
+    
+    with open(path, 'rb') as f:
+        try:
+            for event, value in ijson.basic_parse(f):
+                if depth == 0 and event != 'start_map':
+                    raise ValueError("dashboard data is not a JSON object")
+                if event == 'map_key':
+                    if depth == 1:
+                        top_key, project = value, None
+                    elif depth == 2 and top_key == 'projects':
+                        project = skeleton['projects'][value] = {}
+                    elif depth == 3 and project is not None:
+                        project[value] = None
+                elif event in ('start_map', 'start_array'):
+                    if depth == 1:
+                        skeleton[top_key] = {} if event == 'start_map' else []
+                    depth += 1
+                elif event in ('end_map', 'end_array'):
+                    depth -= 1
+                elif depth == 1:
+                    skeleton[top_key] = value
+        except ijson.JSONError as e:
+            # Covers empty and truncated files; report them like the other loaders
+            raise ValueError(str(e).splitlines()[0]) from e
     
-    dashboard_file = Path(__file__).parent.parent / "active" / "Project Management" / "dashboard" / "projects-data.json"
+    return skeleton
+
+def decode_dashboard_schema(path):
+    """Decode the dashboard file against the schema structs in one pass
+    
+    Returns the schema fields as plain dicts, or None when the file is valid
+    JSON but does not match the schema.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return msgspec.json.decode(b"")  # mmap rejects empty files; raise the usual parse error
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            try:
+                return msgspec.to_builtins(msgspec.json.decode(mm, type=_DashboardSchema))
+            except msgspec.ValidationError:
+                return None
+
+def read_dashboard_file(path=_DASHBOARD_FILE):
+    """Read the dashboard file for the compatibility checks
+    
+    Tries the msgspec schema decode first. A file that does not match the
+    schema falls through to the other loaders so the per-check report shows
+    what is missing. Next come the ijson key-only skeleton and simdjson's lazy
+    DOM, so values the checks never look at are not built; the orjson/json
+    loader is the last resort. Parse errors, including for an empty file,
+    surface as ValueError.
+    """
+    if msgspec is not None:
+        data = decode_dashboard_schema(path)
+        if data is not None:
+            return data
+    if ijson is not None:
+        return load_dashboard_skeleton(path)
+    if simdjson is not None:
+        return simdjson.Parser().parse(Path(path).read_bytes())
+    with open(path, 'rb') as f:
+        return load_json(f)
+
+def validate_dashboard_compatibility(data=None):
+    """Validate that generated data is compatible with dashboard JS
+    
+    Checks the in-memory ``data`` when given, otherwise loads the dashboard file.
+    """
+    print("\n🔧 Validating Dashboard Compatibility:")
     
-    if not dashboard_file.exists():
-        print("   ❌ Dashboard data file not found")
-        return False
+    if data is None:
+        try:
+            data = read_dashboard_file()
+        except FileNotFoundError:
+            print("   ❌ Dashboard data file not found")
+            return False
+        except ValueError as e:
+            print(f"   ❌ Dashboard data file is not valid JSON: {e}")
+            return False
     
-    with open(dashboard_file, 'r') as f:
-        data = json.load(f)
+    projects = data.get("projects")
+    project_records = projects.values() if isinstance(projects, JSON_OBJECT_TYPES) else ()
     
     # Check data structure compatibility
     compatibility_checks = [
-        ("Has projects object", "projects" in data and isinstance(data["projects"], dict)),
-        ("Has summary object", "summary" in data and isinstance(data["summary"], dict)),
+        ("Has projects object", isinstance(projects, JSON_OBJECT_TYPES)),
+        ("Has summary object", isinstance(data.get("summary"), JSON_OBJECT_TYPES)),
         ("Projects have required fields", all(
-            all(field in project for field in ['id', 'title', 'status', 'progress']) 
-            for project in data.get("projects", {}).values()
+            _REQUIRED_PROJECT_FIELDS.issubset(project) for project in project_records
         )),
         ("Token status available", "token_status" in data),
         ("Security summary available", "security_summary" in data)
@@ -142,8 +306,8 @@ def validate_dashboard_compatibility():
     return all_passed
 
 if __name__ == "__main__":
-    success = test_dashboard_data_integration()
-    compatible = validate_dashboard_compatibility()
+    success, dashboard_data = test_dashboard_data_integration()
+    compatible = validate_dashboard_compatibility(dashboard_data)
     
     if success and compatible:
         print("\n✅ Dashboard integration test completed successfully!")
@@ -7,12 +7,26 @@ Demonstrates token tracking across all Personal OS components
 import sys
 from pathlib import Path
 
+_HERE = Path(__file__).resolve().parent
+
 # Import token tracker integration
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(_HERE))
+import functools
 import importlib.util
-spec = importlib.util.spec_from_file_location("token_tracker", Path(__file__).parent / "token-tracker-integration.py")
-tracker_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(tracker_module)
+
+@functools.lru_cache(maxsize=None)
+def _load_hyphenated(name, path):
+    """Load a module from a hyphenated file name, reusing it if already imported"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+tracker_module = _load_hyphenated("token_tracker", _HERE / "token-tracker-integration.py")
 
 def test_token_tracking():
     """Test comprehensive token tracking system"""
@@ -39,8 +53,9 @@ def test_token_tracking():
     # Test budget checking
     print("\n2. Budget Status:")
     status = tracker_module.check_budget()
-    print(f"   Daily: {status['daily']['used']:.1f}/{status['daily']['budget']:.1f} tokens ({status['daily']['percentage']:.1f}%)")
-    print(f"   Weekly: {status['weekly']['used']}/{status['weekly']['budget']} tokens ({status['weekly']['percentage']:.1f}%)")
+    daily, weekly = status['daily'], status['weekly']
+    print(f"   Daily: {daily['used']:.1f}/{daily['budget']:.1f} tokens ({daily['percentage']:.1f}%)")
+    print(f"   Weekly: {weekly['used']}/{weekly['budget']} tokens ({weekly['percentage']:.1f}%)")
     
     # Test AI consultation check
     print("\n3. AI Budget Decisions:")
@@ -85,7 +100,8 @@ def test_token_tracking():
             print(f"     • {rec}")
     
     print("\n✅ Token tracking integration test complete!")
-    print(f"📊 Session summary: {status['session']['tokens']} tokens, {status['session']['prompts']} prompts")
+    session = status['session']
+    print(f"📊 Session summary: {session['tokens']} tokens, {session['prompts']} prompts")
     
     return analytics
 
@@ -97,8 +113,7 @@ def test_budget_warnings():
     # Simulate high usage to trigger warnings
     print("Simulating high token usage...")
     
-    for i in range(20):
-        tracker_module.track_operation(f"simulation_{i}", 30)
+    tracker_module.get_tracker()._inject_usage_for_tests(20 * 30)
     
     # Check if warnings are triggered
     status = tracker_module.check_budget()
@@ -7,14 +7,84 @@ Manual sync triggers per project or bulk operations
 """
 
 import json
+import mmap
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 import hashlib
 import logging
 
+try:
+    import orjson
+    
+    def load_json(f):
+        """Parse JSON from a binary file handle"""
+        return orjson.loads(f.read())
+    
+    def dump_json(data, f, pretty=True):
+        """Write JSON to a binary file handle, indented unless pretty is False"""
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None))
+except ImportError:
+    def load_json(f):
+        """Parse JSON from a binary file handle"""
+        return json.load(f)
+    
+    def dump_json(data, f, pretty=True):
+        """Write JSON to a binary file handle, indented unless pretty is False"""
+        if pretty:
+            f.write(json.dumps(data, indent=2).encode())
+        else:
+            f.write(json.dumps(data, separators=(',', ':')).encode())
+
+try:
+    import xxhash
+    _file_hasher = xxhash.xxh64
+except ImportError:
+    _file_hasher = hashlib.md5
+
+# Layout of todo-cache.json; caches written with another version are discarded on load.
+# 2: sections reference tasks by task_indices instead of carrying a tasks list
+_CACHE_VERSION = 2
+
+# Line patterns, compiled once for every TODO.md scanned
+_SECTION_RE = re.compile(r'#+\s*(.*)')
+_TASK_RE = re.compile(r'^\s*[-*]\s*\[(.?)\]\s*(.*)')
+
+# First non-blank characters of lines that can be a header or a task
+_LINE_STARTS = frozenset('#-*')
+
+# Priority levels and their markers, highest first; the first marker found wins
+_PRIORITY_MARKERS = (
+    ("high", ('urgent', '!high', 'critical', '🔥')),
+    ("medium", ('important', '!medium', '⚡')),
+    ("low", ('!low', 'nice to have', '🔸'))
+)
+
+# Task metadata patterns, e.g. "due: 2025-01-15", "by Jan 15", "@2025-01-15"
+_DUE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'due:\s*(\d{4}-\d{2}-\d{2})',
+    r'by\s*(\w+\s+\d{1,2})',
+    r'@(\d{4}-\d{2}-\d{2})'
+))
+
+# e.g. "depends on: task-id", "after: project:task"
+_DEPENDENCY_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'depends on:\s*([\w-]+(?::[\w-]+)?)',
+    r'after:\s*([\w-]+(?::[\w-]+)?)',
+    r'blocked by:\s*([\w-]+(?::[\w-]+)?)'
+))
+
+# e.g. "@project-name", "in: project-name"
+_REFERENCE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'@([\w-]+)',
+    r'in:\s*([\w-]+)',
+    r'project:\s*([\w-]+)'
+))
+
 class TodoAggregationEngine:
     def __init__(self, base_path=None):
         self.base_path = Path(base_path) if base_path else Path(__file__).parent.parent
@@ -23,8 +93,8 @@ class TodoAggregationEngine:
         self.cache_file = self.systems_dir / "todo-cache.json"
         self.aggregated_file = self.systems_dir / "aggregated-todos.json"
         
-        # Setup logging
-        self.setup_logging()
+        # Logging is set up on first use, so read-only CLI actions never open the log file
+        self._logger = None
         
         # Load cache and registry
         self.cache = self.load_cache()
@@ -34,155 +104,201 @@ class TodoAggregationEngine:
         print(f"   Cache file: {self.cache_file}")
         print(f"   Aggregated output: {self.aggregated_file}")
     
+    @property
+    def logger(self) -> logging.Logger:
+        """Engine logger, configured on first access"""
+        if self._logger is None:
+            self.setup_logging()
+        return self._logger
+    
     def setup_logging(self):
         """Setup logging for TODO engine"""
-        log_file = self.systems_dir / "todo-aggregation.log"
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        # basicConfig is process-global; only build (and open) handlers once
+        if not logging.getLogger().handlers:
+            log_file = self.systems_dir / "todo-aggregation.log"
+            
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(levelname)s - %(message)s',
+                handlers=[
+                    logging.FileHandler(log_file),
+                    logging.StreamHandler()
+                ]
+            )
+        self._logger = logging.getLogger(__name__)
     
     def load_cache(self) -> Dict:
-        """Load TODO parsing cache"""
+        """Load TODO parsing cache
+        
+        A cache from another format version is discarded, and parses without
+        file metadata are dropped, so those files are parsed again.
+        """
         if self.cache_file.exists():
             try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
+                with open(self.cache_file, 'rb') as f:
+                    cache = load_json(f)
+                if cache.get("version") == _CACHE_VERSION:
+                    file_meta = cache["file_meta"]
+                    for section in ("file_hashes", "parsed_todos"):
+                        entries = cache[section]
+                        if not file_meta.keys() >= entries.keys():
+                            cache[section] = {path: entry for path, entry in entries.items() if path in file_meta}
+                    return cache
+                self.logger.info(f"Discarding TODO cache with format version {cache.get('version')}")
             except Exception as e:
                 self.logger.error(f"Error loading cache: {e}")
         
         return {
+            "version": _CACHE_VERSION,
             "last_scan": "",
             "file_hashes": {},
+            "file_meta": {},
             "parsed_todos": {},
             "cross_references": {},
             "priority_matrix": {}
         }
     
     def save_cache(self):
-        """Save TODO parsing cache"""
+        """Save TODO parsing cache
+        
+        The cache is machine-only, so it is written compactly to a temp file and
+        swapped in; an interrupted save leaves the previous cache intact.
+        """
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
+            tmp_path = self.cache_file.with_suffix(self.cache_file.suffix + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                dump_json(self.cache, f, pretty=False)
+            os.replace(tmp_path, self.cache_file)
         except Exception as e:
             self.logger.error(f"Error saving cache: {e}")
     
     def load_project_registry(self) -> Dict:
         """Load project registry"""
         try:
-            with open(self.project_registry_path, 'r') as f:
-                return json.load(f)
+            with open(self.project_registry_path, 'rb') as f:
+                return load_json(f)
         except Exception as e:
             self.logger.error(f"Error loading project registry: {e}")
             return {"projects": {}}
     
     def get_file_hash(self, file_path: Path) -> str:
-        """Get MD5 hash of file contents"""
+        """Get xxh64 hash of file contents (MD5 when xxhash is not installed)"""
         try:
             with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
+                if os.fstat(f.fileno()).st_size == 0:
+                    return _file_hasher().hexdigest()  # mmap rejects empty files
+                # Hash straight from the page cache instead of copying the file into bytes
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return _file_hasher(mm).hexdigest()
         except Exception:
             return ""
     
-    def parse_todo_file(self, file_path: Path, project_id: str) -> Dict:
+    def parse_todo_file(self, file_path: Path, project_id: str, now_iso: str = None) -> Dict:
         """Parse a single TODO.md file"""
+        now_iso = now_iso or datetime.now().isoformat()
+        # Every task repeats the project id and section name; share one string object each
+        project_id = sys.intern(project_id)
         try:
-            content = file_path.read_text()
-            
             todo_data = {
                 "project_id": project_id,
                 "file_path": str(file_path),
-                "parsed_at": datetime.now().isoformat(),
+                "parsed_at": now_iso,
                 "sections": {},
                 "tasks": [],
-                "cross_references": [],
-                "priorities": {},
-                "stats": {
-                    "total_tasks": 0,
-                    "completed_tasks": 0,
-                    "high_priority": 0,
-                    "blocked_tasks": 0,
-                    "due_tasks": 0
-                }
+                "priorities": {}
             }
             
-            current_section = "general"
-            lines = content.split('\\n')
+            # Local bindings for the per-line loop; stats are written back afterwards
+            sections = todo_data["sections"]
+            tasks = todo_data["tasks"]
+            tasks_append = tasks.append
+            extract_task_metadata = self.extract_task_metadata
+            total_tasks = completed_tasks = high_priority = blocked_tasks = due_tasks = cross_references_count = 0
             
-            for line_num, line in enumerate(lines, 1):
-                original_line = line
-                line = line.strip()
-                
-                # Section headers
-                if line.startswith('#'):
-                    section_match = re.search(r'#+\\s*(.*)', line)
-                    if section_match:
-                        current_section = section_match.group(1).lower().replace(' ', '_')
-                        todo_data["sections"][current_section] = {
-                            "line": line_num,
-                            "title": section_match.group(1),
-                            "tasks": []
-                        }
-                    continue
-                
-                # Task lines - support both formats: "- [ ]" and "- [x]" 
-                task_match = re.match(r'^\\s*[-*]\\s*\\[(.?)\\]\\s*(.*)', original_line)
-                if task_match:
-                    completed = task_match.group(1).lower() == 'x'
-                    task_text = task_match.group(2)
-                    
-                    # Parse task metadata
-                    priority = self.extract_priority(task_text)
-                    due_date = self.extract_due_date(task_text)
-                    dependencies = self.extract_dependencies(task_text)
-                    project_refs = self.extract_project_references(task_text)
-                    blocked = 'blocked' in task_text.lower() or 'waiting' in task_text.lower()
+            current_section = "general"
+            # Index list of the current section; the implicit "general" one is made on its first task
+            current_section_indices = None
+            # Stream lines instead of holding the file and a list of its lines
+            with open(file_path, 'r', encoding='utf-8', buffering=1 << 20) as fh:
+                for line_num, line in enumerate(fh, 1):
+                    # Skip blank and prose lines before any regex work
+                    stripped = line.lstrip()
+                    if stripped[:1] not in _LINE_STARTS:
+                        continue
                     
-                    task = {
-                        "id": f"{project_id}:{line_num}",
-                        "text": task_text,
-                        "completed": completed,
-                        "section": current_section,
-                        "line_number": line_num,
-                        "priority": priority,
-                        "due_date": due_date,
-                        "dependencies": dependencies,
-                        "project_references": project_refs,
-                        "blocked": blocked,
-                        "project_id": project_id
-                    }
+                    original_line = line
+                    line = stripped.rstrip()
                     
-                    todo_data["tasks"].append(task)
+                    # Section headers
+                    if line.startswith('#'):
+                        section_match = _SECTION_RE.search(line)
+                        if section_match:
+                            current_section = sys.intern(section_match.group(1).lower().replace(' ', '_'))
+                            current_section_indices = []
+                            sections[current_section] = {
+                                "line": line_num,
+                                "title": section_match.group(1),
+                                "task_indices": current_section_indices
+                            }
+                        continue
                     
-                    # Add to section
-                    if current_section not in todo_data["sections"]:
-                        todo_data["sections"][current_section] = {
-                            "line": line_num,
-                            "title": current_section.title(),
-                            "tasks": []
+                    # Task lines - support both formats: "- [ ]" and "- [x]" 
+                    task_match = _TASK_RE.match(original_line)
+                    if task_match:
+                        completed = task_match.group(1).lower() == 'x'
+                        task_text = task_match.group(2)
+                        
+                        # Parse task metadata
+                        priority, due_date, dependencies, project_refs, blocked = extract_task_metadata(task_text)
+                        
+                        task = {
+                            "id": f"{project_id}:{line_num}",
+                            "text": task_text,
+                            "completed": completed,
+                            "section": current_section,
+                            "line_number": line_num,
+                            "priority": priority,
+                            "due_date": due_date,
+                            "dependencies": dependencies,
+                            "project_references": project_refs,
+                            "blocked": blocked,
+                            "project_id": project_id
                         }
-                    todo_data["sections"][current_section]["tasks"].append(task)
-                    
-                    # Update stats
-                    todo_data["stats"]["total_tasks"] += 1
-                    if completed:
-                        todo_data["stats"]["completed_tasks"] += 1
-                    if priority == "high":
-                        todo_data["stats"]["high_priority"] += 1
-                    if blocked:
-                        todo_data["stats"]["blocked_tasks"] += 1
-                    if due_date:
-                        todo_data["stats"]["due_tasks"] += 1
-                    
-                    # Track cross-references
-                    if project_refs:
-                        todo_data["cross_references"].extend(project_refs)
+                        
+                        # Add to section by position in the task list rather than a second copy
+                        if current_section_indices is None:
+                            current_section_indices = []
+                            sections[current_section] = {
+                                "line": line_num,
+                                "title": current_section.title(),
+                                "task_indices": current_section_indices
+                            }
+                        current_section_indices.append(len(tasks))
+                        tasks_append(task)
+                        
+                        # Update stats
+                        total_tasks += 1
+                        if completed:
+                            completed_tasks += 1
+                        if priority == "high":
+                            high_priority += 1
+                        if blocked:
+                            blocked_tasks += 1
+                        if due_date:
+                            due_tasks += 1
+                        
+                        # Count cross-references; the references themselves stay on the task
+                        if project_refs:
+                            cross_references_count += len(project_refs)
+            
+            todo_data["stats"] = {
+                "total_tasks": total_tasks,
+                "completed_tasks": completed_tasks,
+                "high_priority": high_priority,
+                "blocked_tasks": blocked_tasks,
+                "due_tasks": due_tasks,
+                "cross_references_count": cross_references_count
+            }
             
             return todo_data
             
@@ -192,31 +308,40 @@ class TodoAggregationEngine:
                 "project_id": project_id,
                 "file_path": str(file_path),
                 "error": str(e),
-                "parsed_at": datetime.now().isoformat()
+                "parsed_at": now_iso
             }
     
+    def extract_task_metadata(self, task_text: str) -> Tuple[str, Optional[str], List[str], List[str], bool]:
+        """Extract priority, due date, dependencies, project references and blocked flag
+        
+        The text is lowercased once for both the priority and blocked checks.
+        """
+        text_lower = task_text.lower()
+        return (
+            self.priority_from_lower(text_lower),
+            self.extract_due_date(task_text),
+            self.extract_dependencies(task_text),
+            self.extract_project_references(task_text),
+            'blocked' in text_lower or 'waiting' in text_lower
+        )
+    
     def extract_priority(self, task_text: str) -> str:
         """Extract priority from task text"""
-        text_lower = task_text.lower()
-        if any(marker in text_lower for marker in ['urgent', '!high', 'critical', '🔥']):
-            return "high"
-        elif any(marker in text_lower for marker in ['important', '!medium', '⚡']):
-            return "medium"
-        elif any(marker in text_lower for marker in ['!low', 'nice to have', '🔸']):
-            return "low"
+        return self.priority_from_lower(task_text.lower())
+    
+    @staticmethod
+    def priority_from_lower(text_lower: str) -> str:
+        """Classify priority from already lowercased task text"""
+        for level, markers in _PRIORITY_MARKERS:
+            for marker in markers:
+                if marker in text_lower:
+                    return level
         return "normal"
     
     def extract_due_date(self, task_text: str) -> Optional[str]:
         """Extract due date from task text"""
-        # Look for patterns like "due: 2025-01-15", "by Jan 15", "@2025-01-15"
-        patterns = [
-            r'due:\\s*(\\d{4}-\\d{2}-\\d{2})',
-            r'by\\s*(\\w+\\s+\\d{1,2})',
-            r'@(\\d{4}-\\d{2}-\\d{2})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, task_text, re.IGNORECASE)
+        for pattern in _DUE_PATTERNS:
+            match = pattern.search(task_text)
             if match:
                 return match.group(1)
         
@@ -224,88 +349,101 @@ class TodoAggregationEngine:
     
     def extract_dependencies(self, task_text: str) -> List[str]:
         """Extract task dependencies"""
-        # Look for patterns like "depends on: task-id", "after: project:task"
         dependencies = []
         
-        patterns = [
-            r'depends on:\\s*([\\w-]+(?::[\\w-]+)?)',
-            r'after:\\s*([\\w-]+(?::[\\w-]+)?)',
-            r'blocked by:\\s*([\\w-]+(?::[\\w-]+)?)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, task_text, re.IGNORECASE)
-            dependencies.extend(matches)
+        for pattern in _DEPENDENCY_PATTERNS:
+            dependencies.extend(pattern.findall(task_text))
         
         return dependencies
     
     def extract_project_references(self, task_text: str) -> List[str]:
         """Extract project references"""
-        # Look for patterns like "@project-name", "in: project-name"
         references = []
         
-        patterns = [
-            r'@([\\w-]+)',
-            r'in:\\s*([\\w-]+)',
-            r'project:\\s*([\\w-]+)'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, task_text, re.IGNORECASE)
-            references.extend(matches)
+        for pattern in _REFERENCE_PATTERNS:
+            references.extend(pattern.findall(task_text))
         
         return references
     
-    def scan_project_todos(self, project_id: str, force_refresh: bool = False) -> Optional[Dict]:
+    def scan_project_todos(self, project_id: str, force_refresh: bool = False, now_iso: str = None) -> Optional[Dict]:
         """Scan TODOs for a specific project"""
+        todo_data, cache_update = self._scan_project(project_id, force_refresh, now_iso)
+        if cache_update:
+            self._apply_cache_update(cache_update)
+        return todo_data
+    
+    def _scan_project(self, project_id: str, force_refresh: bool = False,
+                      now_iso: str = None) -> Tuple[Optional[Dict], Optional[Tuple]]:
+        """Scan one project without touching the cache
+        
+        Returns the TODO data and a (todo_key, file_meta, file_hash, todo_data)
+        cache update, or None when the cache is already current. file_hash and
+        todo_data are None when only the file metadata changed.
+        """
         projects = self.project_registry.get("projects", {})
         
         if project_id not in projects:
             self.logger.error(f"Project {project_id} not found in registry")
-            return None
+            return None, None
         
         project = projects[project_id]
         project_path = Path(project["path"])
         
         if not project_path.exists():
             self.logger.warning(f"Project path does not exist: {project_path}")
-            return None
+            return None, None
         
         todo_file = project_path / "TODO.md"
         
-        if not todo_file.exists():
+        try:
+            stat = todo_file.stat()
+        except FileNotFoundError:
             # No TODO file, return empty structure
             return {
                 "project_id": project_id,
                 "file_path": str(todo_file),
                 "exists": False,
-                "parsed_at": datetime.now().isoformat(),
+                "parsed_at": now_iso or datetime.now().isoformat(),
                 "stats": {"total_tasks": 0, "completed_tasks": 0, "high_priority": 0, "blocked_tasks": 0, "due_tasks": 0}
-            }
+            }, None
+        
+        # Check if file has changed: size and mtime first, content hash only when they differ
+        todo_key = str(todo_file)
+        file_meta = [stat.st_size, stat.st_mtime_ns]
+        cached_todos = self.cache["parsed_todos"].get(todo_key)
+        
+        if not force_refresh and cached_todos is not None:
+            if self.cache["file_meta"].get(todo_key) == file_meta:
+                self.logger.debug(f"Using cached TODO data for {project_id}")
+                return cached_todos, None
         
-        # Check if file has changed
         current_hash = self.get_file_hash(todo_file)
-        cached_hash = self.cache["file_hashes"].get(str(todo_file), "")
         
-        if not force_refresh and current_hash == cached_hash and str(todo_file) in self.cache["parsed_todos"]:
-            self.logger.debug(f"Using cached TODO data for {project_id}")
-            return self.cache["parsed_todos"][str(todo_file)]
+        if not force_refresh and cached_todos is not None and current_hash == self.cache["file_hashes"].get(todo_key, ""):
+            self.logger.debug(f"Using cached TODO data for {project_id} (touched, unchanged)")
+            return cached_todos, (todo_key, file_meta, None, None)
         
         # Parse the file
         self.logger.info(f"Parsing TODO file: {todo_file}")
-        todo_data = self.parse_todo_file(todo_file, project_id)
-        
-        # Update cache
-        self.cache["file_hashes"][str(todo_file)] = current_hash
-        self.cache["parsed_todos"][str(todo_file)] = todo_data
+        todo_data = self.parse_todo_file(todo_file, project_id, now_iso)
         
-        return todo_data
+        return todo_data, (todo_key, file_meta, current_hash, todo_data)
+    
+    def _apply_cache_update(self, cache_update: Tuple):
+        """Record a cache update returned by _scan_project"""
+        todo_key, file_meta, file_hash, todo_data = cache_update
+        self.cache["file_meta"][todo_key] = file_meta
+        if todo_data is not None:
+            self.cache["file_hashes"][todo_key] = file_hash
+            self.cache["parsed_todos"][todo_key] = todo_data
     
     def scan_all_projects(self, force_refresh: bool = False) -> Dict:
         """Scan all projects for TODOs"""
         print(f"\\n📋 SCANNING PROJECT TODOs {'(FORCE REFRESH)' if force_refresh else ''}")
         print("=" * 80)
         
+        # One timestamp for the whole scan, shared by every parsed file
+        now_iso = datetime.now().isoformat()
         projects = self.project_registry.get("projects", {})
         all_todos = {}
         stats = {
@@ -318,9 +456,19 @@ class TodoAggregationEngine:
             "cross_references": 0
         }
         
-        for project_id in projects:
+        # Configure logging before the workers first touch the lazy logger, so
+        # setup_logging runs once instead of racing in several threads
+        self.logger
+        
+        # Hash and parse projects concurrently; cache updates are merged here in registry order
+        with ThreadPoolExecutor(max_workers=min(32, len(projects)) or 1) as executor:
+            results = executor.map(lambda pid: self._scan_project(pid, force_refresh, now_iso), projects)
+            scanned = list(zip(projects, results))
+        
+        for project_id, (todo_data, cache_update) in scanned:
             print(f"   📁 Scanning {project_id}...")
-            todo_data = self.scan_project_todos(project_id, force_refresh)
+            if cache_update:
+                self._apply_cache_update(cache_update)
             
             if todo_data:
                 all_todos[project_id] = todo_data
@@ -333,9 +481,22 @@ class TodoAggregationEngine:
                 stats["high_priority_tasks"] += task_stats.get("high_priority", 0)
                 stats["blocked_tasks"] += task_stats.get("blocked_tasks", 0)
                 
-                # Count cross-references
-                cross_refs = todo_data.get("cross_references", [])
-                stats["cross_references"] += len(cross_refs)
+                # Count cross-references (older cache entries still carry the list)
+                stats["cross_references"] += task_stats.get(
+                    "cross_references_count", len(todo_data.get("cross_references", []))
+                )
+                
+                # Refresh derived fragments so they are saved with the cache below
+                if "tasks" in todo_data:
+                    self.project_matrix_fragment(todo_data)
+                    self.project_dependency_fragment(todo_data)
+        
+        # Drop entries for TODO files no registered project points at any more
+        seen_paths = {todo_data["file_path"] for todo_data in all_todos.values()}
+        for section in ("file_hashes", "file_meta", "parsed_todos", "priority_matrix", "cross_references"):
+            entries = self.cache[section]
+            if not seen_paths.issuperset(entries):
+                self.cache[section] = {path: entry for path, entry in entries.items() if path in seen_paths}
         
         # Save cache
         self.save_cache()
@@ -351,7 +512,7 @@ class TodoAggregationEngine:
         return {
             "todos": all_todos,
             "stats": stats,
-            "scanned_at": datetime.now().isoformat()
+            "scanned_at": now_iso
         }
     
     def generate_priority_matrix(self, todo_data: Dict) -> Dict:
@@ -366,36 +527,64 @@ class TodoAggregationEngine:
         for project_id, project_todos in todo_data["todos"].items():
             if "tasks" not in project_todos:
                 continue
-                
-            for task in project_todos["tasks"]:
-                if task["completed"]:
-                    continue
-                
-                priority = task.get("priority", "normal")
-                
-                # Determine time frame based on due date
-                time_frame = "long_term"  # default
-                due_date = task.get("due_date")
-                
-                if due_date:
-                    try:
-                        # Simple date parsing - could be enhanced
-                        if "today" in due_date.lower() or "asap" in task["text"].lower():
-                            time_frame = "immediate"
-                        elif any(word in due_date.lower() for word in ["week", "soon"]):
-                            time_frame = "short_term"
-                    except:
-                        pass
-                elif task.get("blocked"):
-                    time_frame = "immediate"  # Blocked tasks need immediate attention
-                
-                matrix[priority][time_frame].append({
-                    "task": task,
-                    "project": project_id
-                })
+            
+            tasks = project_todos["tasks"]
+            for priority, time_frames in self.project_matrix_fragment(project_todos).items():
+                for time_frame, task_indices in time_frames.items():
+                    matrix[priority][time_frame].extend(
+                        {"task": tasks[i], "project": project_id} for i in task_indices
+                    )
         
         return matrix
     
+    def project_matrix_fragment(self, project_todos: Dict) -> Dict:
+        """Open task indices of one TODO file by priority and time frame, cached by file hash"""
+        return self._cached_fragment("priority_matrix", project_todos, self._build_matrix_fragment)
+    
+    def _build_matrix_fragment(self, project_todos: Dict) -> Dict:
+        """Place each open task of one TODO file in the priority matrix"""
+        fragment = {}
+        
+        for index, task in enumerate(project_todos["tasks"]):
+            if task["completed"]:
+                continue
+            
+            priority = task.get("priority", "normal")
+            
+            # Determine time frame based on due date
+            time_frame = "long_term"  # default
+            due_date = task.get("due_date")
+            
+            if due_date:
+                try:
+                    # Simple date parsing - could be enhanced
+                    if "today" in due_date.lower() or "asap" in task["text"].lower():
+                        time_frame = "immediate"
+                    elif any(word in due_date.lower() for word in ["week", "soon"]):
+                        time_frame = "short_term"
+                except:
+                    pass
+            elif task.get("blocked"):
+                time_frame = "immediate"  # Blocked tasks need immediate attention
+            
+            fragment.setdefault(priority, {}).setdefault(time_frame, []).append(index)
+        
+        return fragment
+    
+    def _cached_fragment(self, cache_section: str, project_todos: Dict, build) -> Any:
+        """Return a derived per-file fragment from the cache, rebuilding it when the file hash changed"""
+        todo_key = project_todos.get("file_path")
+        file_hash = self.cache["file_hashes"].get(todo_key)
+        entry = self.cache[cache_section].get(todo_key)
+        
+        if file_hash and entry and entry["hash"] == file_hash:
+            return entry["fragment"]
+        
+        fragment = build(project_todos)
+        if file_hash:
+            self.cache[cache_section][todo_key] = {"hash": file_hash, "fragment": fragment}
+        return fragment
+    
     def generate_cross_project_dependencies(self, todo_data: Dict) -> Dict:
         """Generate cross-project dependency graph"""
         dependencies = {}
@@ -404,37 +593,46 @@ class TodoAggregationEngine:
             if "tasks" not in project_todos:
                 continue
             
-            project_deps = []
+            project_deps = self.project_dependency_fragment(project_todos)
+            if project_deps:
+                dependencies[project_id] = project_deps
+        
+        return dependencies
+    
+    def project_dependency_fragment(self, project_todos: Dict) -> List[Dict]:
+        """Cross-project dependencies of one TODO file, cached by file hash"""
+        return self._cached_fragment("cross_references", project_todos, self._build_dependency_fragment)
+    
+    def _build_dependency_fragment(self, project_todos: Dict) -> List[Dict]:
+        """Collect task dependencies and project references from one TODO file"""
+        project_deps = []
+        
+        for task in project_todos["tasks"]:
+            if task["completed"]:
+                continue
             
-            for task in project_todos["tasks"]:
-                if task["completed"]:
-                    continue
-                
-                # Task dependencies
-                for dep in task.get("dependencies", []):
-                    if ":" in dep:  # Cross-project dependency
-                        dep_project, dep_task = dep.split(":", 1)
-                        project_deps.append({
-                            "type": "task_dependency",
-                            "source_task": task["id"],
-                            "target_project": dep_project,
-                            "target_task": dep_task,
-                            "blocked": True
-                        })
-                
-                # Project references
-                for ref in task.get("project_references", []):
+            # Task dependencies
+            for dep in task.get("dependencies", []):
+                if ":" in dep:  # Cross-project dependency
+                    dep_project, dep_task = dep.split(":", 1)
                     project_deps.append({
-                        "type": "project_reference", 
+                        "type": "task_dependency",
                         "source_task": task["id"],
-                        "target_project": ref,
-                        "blocked": False
+                        "target_project": dep_project,
+                        "target_task": dep_task,
+                        "blocked": True
                     })
             
-            if project_deps:
-                dependencies[project_id] = project_deps
+            # Project references
+            for ref in task.get("project_references", []):
+                project_deps.append({
+                    "type": "project_reference", 
+                    "source_task": task["id"],
+                    "target_project": ref,
+                    "blocked": False
+                })
         
-        return dependencies
+        return project_deps
     
     def save_aggregated_data(self, todo_data: Dict):
         """Save aggregated TODO data"""
@@ -456,8 +654,8 @@ class TodoAggregationEngine:
         }
         
         try:
-            with open(self.aggregated_file, 'w') as f:
-                json.dump(aggregated, f, indent=2)
+            with open(self.aggregated_file, 'wb') as f:
+                dump_json(aggregated, f)
             
             print(f"✅ Aggregated TODO data saved to: {self.aggregated_file}")
             self.logger.info(f"Saved aggregated TODO data: {len(aggregated['todos_by_project'])} projects")
@@ -508,8 +706,8 @@ def main():
         elif args.action == "matrix":
             # Load existing aggregated data
             if engine.aggregated_file.exists():
-                with open(engine.aggregated_file, 'r') as f:
-                    data = json.load(f)
+                with open(engine.aggregated_file, 'rb') as f:
+                    data = load_json(f)
                 
                 print(f"\\n📋 TODO PRIORITY MATRIX")
                 print("=" * 80)
@@ -534,8 +732,8 @@ def main():
         elif args.action == "dependencies":
             # Show cross-project dependencies
             if engine.aggregated_file.exists():
-                with open(engine.aggregated_file, 'r') as f:
-                    data = json.load(f)
+                with open(engine.aggregated_file, 'rb') as f:
+                    data = load_json(f)
                 
                 print(f"\\n🔗 CROSS-PROJECT DEPENDENCIES")
                 print("=" * 80)
@@ -557,8 +755,8 @@ def main():
         elif args.action == "stats":
             # Show TODO statistics
             if engine.aggregated_file.exists():
-                with open(engine.aggregated_file, 'r') as f:
-                    data = json.load(f)
+                with open(engine.aggregated_file, 'rb') as f:
+                    data = load_json(f)
                 
                 print(f"\\n📊 TODO STATISTICS")
                 print("=" * 80)
@@ -4,6 +4,7 @@ Token Tracker Integration Module
 Provides easy integration for Personal OS components to track token usage
 """
 
+import functools
 import os
 import sys
 from pathlib import Path
@@ -12,20 +13,27 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import importlib.util
-spec = importlib.util.spec_from_file_location("token_usage_tracker", Path(__file__).parent / "token-usage-tracker.py")
-token_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(token_module)
-TokenUsageTracker = token_module.TokenUsageTracker
-
-# Global tracker instance
-_tracker_instance = None
 
+@functools.lru_cache(maxsize=None)
+def _load_token_module():
+    """Load token-usage-tracker.py on first use rather than at import"""
+    spec = importlib.util.spec_from_file_location("token_usage_tracker", Path(__file__).parent / "token-usage-tracker.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def __getattr__(name):
+    # Keep token_module and TokenUsageTracker available as module attributes
+    if name == "token_module":
+        return _load_token_module()
+    if name == "TokenUsageTracker":
+        return _load_token_module().TokenUsageTracker
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@functools.lru_cache(maxsize=None)
 def get_tracker():
     """Get the global token tracker instance"""
-    global _tracker_instance
-    if _tracker_instance is None:
-        _tracker_instance = TokenUsageTracker()
-    return _tracker_instance
+    return _load_token_module().TokenUsageTracker()
 
 def track_operation(operation_name: str, estimated_tokens: int = 0, actual_tokens: int = None):
     """
@@ -42,6 +50,19 @@ def track_operation(operation_name: str, estimated_tokens: int = 0, actual_token
     tracker = get_tracker()
     return tracker.record_prompt_usage(operation_name, estimated_tokens, actual_tokens)
 
+def track_operations_bulk(operations):
+    """
+    Track several operations with a single save of the usage file
+    
+    Args:
+        operations: Iterable of (operation_name, estimated_tokens) pairs
+    
+    Returns:
+        list: Usage entry records
+    """
+    tracker = get_tracker()
+    return tracker.record_bulk_usage(operations)
+
 def check_budget():
     """Check current budget status"""
     tracker = get_tracker()
@@ -63,17 +84,14 @@ def should_use_ai(estimated_tokens: int = 100) -> bool:
         bool: True if within budget, False if should avoid AI
     """
     tracker = get_tracker()
-    status = tracker.check_budget_status()
-    
-    weekly_remaining = status["weekly"]["remaining"]
-    weekly_pct = status["weekly"]["percentage"]
+    weekly_remaining = tracker.weekly_remaining_fast()
     
     # Don't use AI if we're over budget
-    if weekly_pct > 100:
+    if weekly_remaining < 0:
         return False
     
-    # Be conservative if approaching budget limit
-    if weekly_pct > 90 and estimated_tokens > 50:
+    # Be conservative if approaching budget limit (over 90% used)
+    if weekly_remaining < tracker.weekly_budget * 0.1 and estimated_tokens > 50:
         return False
     
     # Check if we have enough remaining tokens
@@ -95,12 +113,16 @@ def track_tokens(operation_name: str, estimated_tokens: int = 25):
             # function implementation
     """
     def decorator(func):
+        # Bound once per decorated function rather than looked up as a global per call
+        track = track_operation
+        
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Execute function
             result = func(*args, **kwargs)
             
             # Track token usage
-            track_operation(operation_name, estimated_tokens)
+            track(operation_name, estimated_tokens)
             
             return result
         return wrapper
@@ -115,8 +137,12 @@ class TokenTracker:
         with TokenTracker("project_analysis", 50) as tracker:
             # do analysis work
             tracker.update_tokens(75)  # if actual usage known
+    
+    Operations that raise are not recorded.
     """
     
+    __slots__ = ("operation_name", "estimated_tokens", "actual_tokens")
+    
     def __init__(self, operation_name: str, estimated_tokens: int = 25):
         self.operation_name = operation_name
         self.estimated_tokens = estimated_tokens
@@ -125,8 +151,10 @@ class TokenTracker:
     def __enter__(self):
         return self
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        track_operation(self.operation_name, self.estimated_tokens, self.actual_tokens)
+    def __exit__(self, exc_type, exc_val, exc_tb, _track=track_operation):
+        if exc_type is not None:
+            return
+        _track(self.operation_name, self.estimated_tokens, self.actual_tokens)
     
     def update_tokens(self, actual_tokens: int):
         """Update with actual token count"""
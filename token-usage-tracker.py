@@ -5,16 +5,65 @@ Monitors and tracks AI token consumption across Personal OS operations
 Target: 500-900 tokens/week with analytics and budgeting
 """
 
+import atexit
+import copy
 import os
 import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
-import threading
 import time
 
+try:
+    import orjson
+    
+    def load_json(f):
+        """Parse JSON from a binary file handle"""
+        return orjson.loads(f.read())
+    
+    def dump_json(data, f):
+        """Write indented JSON to a binary file handle"""
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+except ImportError:
+    def load_json(f):
+        """Parse JSON from a binary file handle"""
+        return json.load(f)
+    
+    def dump_json(data, f):
+        """Write indented JSON to a binary file handle"""
+        f.write(json.dumps(data, indent=2).encode())
+
+# Default token estimates by operation type, used when a record carries no count
+_TOKEN_ESTIMATES = MappingProxyType({
+    "project_analysis": 50,
+    "document_parsing": 20,
+    "security_template": 30,
+    "dashboard_sync": 10,
+    "discovery_scan": 15,
+    "ai_consultation": 100,  # When we do need AI
+    "general": 25
+})
+
 class TokenUsageTracker:
+    __slots__ = (
+        "base_path", "systems_dir", "usage_file", "budget_file", "analytics_file",
+        "prompt_counter", "session_tokens", "session_start", "_session_start_ns", "_session_id",
+        "_day_ordinal", "_day_keys_cache", "_day_span", "_budget_cache",
+        "weekly_budget", "warning_threshold", "_warn_pct", "daily_budget", "logger",
+        "usage_data", "_session_index", "_current_session", "_total_prompts", "_op_stats",
+        "_analytics_cache", "_dirty_since_flush", "_last_flush_ts",
+    )
+    
+    # Recorded prompts are saved once this many are pending or this many seconds have passed
+    FLUSH_EVERY = 50
+    FLUSH_INTERVAL = 30
+    # Seconds the last budget warnings are reused, without re-logging, while their inputs are unchanged
+    BUDGET_STATUS_TTL = 1.0
+    # Raw sessions kept in the usage file; older ones are folded into the session archive
+    MAX_SESSIONS = 200
+    
     def __init__(self, base_path=None):
         self.base_path = Path(base_path) if base_path else Path(__file__).parent.parent
         self.systems_dir = self.base_path / "systems"
@@ -28,15 +77,35 @@ class TokenUsageTracker:
         self.prompt_counter = 0
         self.session_tokens = 0
         self.session_start = datetime.now()
+        self._session_start_ns = time.monotonic_ns()
+        self._session_id = self.session_start.isoformat()
+        
+        # (today, week start) ISO keys, recomputed only when the date changes
+        self._day_ordinal = None
+        self._day_keys_cache = None
+        # Epoch seconds of the start and end of the day the cached keys belong to
+        self._day_span = (0.0, 0.0)
+        
+        # (totals and budgets key, monotonic time, warnings) from the last budget check
+        self._budget_cache = None
         
         # Budget settings
         self.weekly_budget = 900  # Maximum tokens per week
         self.warning_threshold = 0.8  # Warn at 80% of budget
+        self._warn_pct = self.warning_threshold * 100
         self.daily_budget = self.weekly_budget / 7
         
         # Setup logging
         self.setup_logging()
         
+        # Running aggregates for analytics; the cached result is dropped on new usage
+        self._analytics_cache = None
+        
+        # Unsaved prompts since the last write; whatever is pending is saved at exit
+        self._dirty_since_flush = 0
+        self._last_flush_ts = time.monotonic()
+        atexit.register(self.flush_pending, durable=True)
+        
         # Load existing data
         self.load_usage_data()
         self.load_budget_settings()
@@ -45,23 +114,25 @@ class TokenUsageTracker:
     
     def setup_logging(self):
         """Setup token tracker logging"""
-        log_file = self.systems_dir / "token-tracker.log"
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
+        # basicConfig is process-global; only build (and open) handlers once
+        if not logging.getLogger().handlers:
+            log_file = self.systems_dir / "token-tracker.log"
+            
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(levelname)s - %(message)s',
+                handlers=[
+                    logging.FileHandler(log_file),
+                    logging.StreamHandler()
+                ]
+            )
         self.logger = logging.getLogger(__name__)
     
     def load_usage_data(self):
         """Load historical token usage data"""
         if self.usage_file.exists():
-            with open(self.usage_file, 'r') as f:
-                self.usage_data = json.load(f)
+            with open(self.usage_file, 'rb') as f:
+                self.usage_data = load_json(f)
         else:
             self.usage_data = {
                 "sessions": [],
@@ -70,20 +141,94 @@ class TokenUsageTracker:
                 "total_tokens": 0,
                 "last_updated": datetime.now().isoformat()
             }
+        self.archive_old_sessions()
+        self.rebuild_aggregates()
+        
+        # Sessions by id, and the session this tracker is currently appending to
+        self._session_index = {s["session_id"]: s for s in self.usage_data.get("sessions", [])}
+        self._current_session = None
+    
+    def archive_old_sessions(self):
+        """Fold the oldest sessions into the session archive once there are more than MAX_SESSIONS"""
+        sessions = self.usage_data.get("sessions", [])
+        if len(sessions) <= self.MAX_SESSIONS:
+            return
+        
+        # Trim to three quarters of the limit so compaction runs only every few dozen sessions
+        cut = len(sessions) - self.MAX_SESSIONS * 3 // 4
+        archive = self.usage_data.setdefault("session_archive", {"sessions": 0, "prompt_count": 0, "op_stats": {}})
+        op_stats = archive["op_stats"]
+        for session in sessions[:cut]:
+            archive["prompt_count"] += session.get("prompt_count", 0)
+            for op in session.get("operations", ()):
+                stats = op_stats.setdefault(op.get("operation", "unknown"), {"count": 0, "total_tokens": 0})
+                stats["count"] += 1
+                stats["total_tokens"] += op.get("tokens", 0)
+        archive["sessions"] += cut
+        del sessions[:cut]
+    
+    def rebuild_aggregates(self):
+        """Recompute the running prompt and per-operation totals from the archive and stored sessions"""
+        archive = self.usage_data.get("session_archive", {})
+        total_prompts = archive.get("prompt_count", 0)
+        counts = {op_type: stats["count"] for op_type, stats in archive.get("op_stats", {}).items()}
+        totals = {op_type: stats["total_tokens"] for op_type, stats in archive.get("op_stats", {}).items()}
+        for session in self.usage_data.get("sessions", []):
+            total_prompts += session.get("prompt_count", 0)
+            for op in session.get("operations", ()):
+                op_type = op.get("operation", "unknown")
+                if op_type in counts:
+                    counts[op_type] += 1
+                    totals[op_type] += op.get("tokens", 0)
+                else:
+                    counts[op_type] = 1
+                    totals[op_type] = op.get("tokens", 0)
+        self._total_prompts = total_prompts
+        self._op_stats = {
+            op_type: {"count": count, "total_tokens": totals[op_type]}
+            for op_type, count in counts.items()
+        }
+        self._analytics_cache = None
+    
+    def _add_op_stats(self, op_type: str, tokens: int):
+        """Fold one operation into the running per-operation totals"""
+        stats = self._op_stats.get(op_type)
+        if stats is None:
+            stats = self._op_stats[op_type] = {"count": 0, "total_tokens": 0}
+        stats["count"] += 1
+        stats["total_tokens"] += tokens
     
-    def save_usage_data(self):
-        """Save token usage data"""
+    def save_usage_data(self, durable: bool = False):
+        """Save token usage data
+        
+        Written to a temp file and swapped in, so an interrupted save leaves the
+        previous data intact. With durable, the file is fsynced before the swap.
+        """
         self.usage_data["last_updated"] = datetime.now().isoformat()
-        with open(self.usage_file, 'w') as f:
-            json.dump(self.usage_data, f, indent=2)
+        tmp_path = self.usage_file.with_suffix(self.usage_file.suffix + '.tmp')
+        # Large buffer so the dump reaches the kernel in a few big writes
+        with open(tmp_path, 'wb', buffering=128 * 1024) as f:
+            dump_json(self.usage_data, f)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.usage_file)
+        self._dirty_since_flush = 0
+        self._last_flush_ts = time.monotonic()
+    
+    def flush_pending(self, durable: bool = False):
+        """Save usage data if any recorded prompts have not been written yet"""
+        if self._dirty_since_flush:
+            self.save_usage_data(durable=durable)
     
     def load_budget_settings(self):
         """Load budget configuration"""
         if self.budget_file.exists():
-            with open(self.budget_file, 'r') as f:
-                budget_config = json.load(f)
+            with open(self.budget_file, 'rb') as f:
+                budget_config = load_json(f)
                 self.weekly_budget = budget_config.get("weekly_budget", 900)
                 self.warning_threshold = budget_config.get("warning_threshold", 0.8)
+                self._warn_pct = self.warning_threshold * 100
                 self.daily_budget = self.weekly_budget / 7
         else:
             # Create default budget settings
@@ -100,10 +245,11 @@ class TokenUsageTracker:
                 "created_at": datetime.now().isoformat()
             }
             
-            with open(self.budget_file, 'w') as f:
-                json.dump(budget_config, f, indent=2)
+            with open(self.budget_file, 'wb') as f:
+                dump_json(budget_config, f)
     
-    def record_prompt_usage(self, operation: str, estimated_tokens: int = 0, actual_tokens: int = None):
+    def record_prompt_usage(self, operation: str, estimated_tokens: int = 0, actual_tokens: int = None,
+                            autosave: bool = True):
         """Record token usage for a prompt/operation"""
         self.prompt_counter += 1
         
@@ -112,130 +258,196 @@ class TokenUsageTracker:
         
         if tokens_used == 0:
             # Default estimation based on operation type
-            token_estimates = {
-                "project_analysis": 50,
-                "document_parsing": 20,
-                "security_template": 30,
-                "dashboard_sync": 10,
-                "discovery_scan": 15,
-                "ai_consultation": 100,  # When we do need AI
-                "general": 25
-            }
-            tokens_used = token_estimates.get(operation, 25)
+            tokens_used = _TOKEN_ESTIMATES.get(operation, 25)
         
         self.session_tokens += tokens_used
         
+        # One clock read per record for the entry and the day/week keys
+        now = datetime.now()
+        today, week_start = self._day_keys(now)
+        
         # Record usage entry
         usage_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "operation": operation,
             "tokens": tokens_used,
             "prompt_number": self.prompt_counter,
-            "session_id": self.session_start.isoformat()
+            "session_id": self._session_id
         }
         
-        # Add to session data
-        if "sessions" not in self.usage_data:
-            self.usage_data["sessions"] = []
-        
-        # Find or create current session
-        current_session = None
-        for session in self.usage_data["sessions"]:
-            if session["session_id"] == self.session_start.isoformat():
-                current_session = session
-                break
-        
-        if not current_session:
-            current_session = {
-                "session_id": self.session_start.isoformat(),
-                "start_time": self.session_start.isoformat(),
-                "operations": [],
-                "total_tokens": 0,
-                "prompt_count": 0
-            }
-            self.usage_data["sessions"].append(current_session)
+        # Find or create current session; looked up once per session, not per prompt
+        current_session = self._current_session
+        if current_session is None:
+            session_id = self._session_id
+            current_session = self._session_index.get(session_id)
+            
+            if current_session is None:
+                current_session = {
+                    "session_id": session_id,
+                    "start_time": session_id,
+                    "operations": [],
+                    "total_tokens": 0,
+                    "prompt_count": 0
+                }
+                self.usage_data.setdefault("sessions", []).append(current_session)
+                self._session_index[session_id] = current_session
+            self._current_session = current_session
         
         current_session["operations"].append(usage_entry)
         current_session["total_tokens"] += tokens_used
         current_session["prompt_count"] += 1
+        self._total_prompts += 1
+        self._add_op_stats(operation, tokens_used)
         
-        # Update daily totals
-        today = datetime.now().date().isoformat()
-        if today not in self.usage_data["daily_totals"]:
-            self.usage_data["daily_totals"][today] = 0
-        self.usage_data["daily_totals"][today] += tokens_used
-        
-        # Update weekly totals
-        week_start = (datetime.now().date() - timedelta(days=datetime.now().weekday())).isoformat()
-        if week_start not in self.usage_data["weekly_totals"]:
-            self.usage_data["weekly_totals"][week_start] = 0
-        self.usage_data["weekly_totals"][week_start] += tokens_used
+        # Update daily, weekly and overall totals
+        self._add_to_totals(today, week_start, tokens_used)
         
-        # Update total
-        self.usage_data["total_tokens"] += tokens_used
-        
-        self.logger.info(f"Token usage recorded: {operation} ({tokens_used} tokens, prompt #{self.prompt_counter})")
+        # Per-record detail only at DEBUG, and only formatted when it will be emitted
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Token usage recorded: {operation} ({tokens_used} tokens, prompt #{self.prompt_counter})")
         
         # Check budget and warn if needed
         if self.prompt_counter % 10 == 0:  # Every 10 prompts
             self.check_budget_status()
         
-        # Auto-save every few operations
-        if self.prompt_counter % 5 == 0:
+        # Batch saves: each one rewrites the whole history
+        self._dirty_since_flush += 1
+        if autosave and (self._dirty_since_flush >= self.FLUSH_EVERY
+                         or time.monotonic() - self._last_flush_ts >= self.FLUSH_INTERVAL):
             self.save_usage_data()
         
         return usage_entry
     
+    def _add_to_totals(self, today: str, week_start: str, tokens_used: int):
+        """Add tokens to the daily, weekly and overall totals
+        
+        Every change to the stored totals goes through here so cached analytics
+        are always invalidated with it.
+        """
+        daily_totals = self.usage_data["daily_totals"]
+        weekly_totals = self.usage_data["weekly_totals"]
+        daily_totals[today] = daily_totals.get(today, 0) + tokens_used
+        weekly_totals[week_start] = weekly_totals.get(week_start, 0) + tokens_used
+        self.usage_data["total_tokens"] += tokens_used
+        self._analytics_cache = None
+    
+    def _day_keys(self, now: datetime) -> Tuple[str, str]:
+        """Today's and this week's (Monday) ISO date keys for now"""
+        ordinal = now.toordinal()
+        if ordinal != self._day_ordinal:
+            today = now.date()
+            self._day_keys_cache = (today.isoformat(), (today - timedelta(days=today.weekday())).isoformat())
+            self._day_ordinal = ordinal
+            midnight = datetime.combine(today, datetime.min.time())
+            self._day_span = (midnight.timestamp(), (midnight + timedelta(days=1)).timestamp())
+        return self._day_keys_cache
+    
+    def record_bulk_usage(self, operations: List[Tuple[str, int]]) -> List[Dict]:
+        """Record several (operation, estimated_tokens) pairs and save once"""
+        entries = [
+            self.record_prompt_usage(operation, estimated_tokens, autosave=False)
+            for operation, estimated_tokens in operations
+        ]
+        if entries:
+            self.save_usage_data()
+        return entries
+    
+    def _inject_usage_for_tests(self, tokens_used: int):
+        """Add tokens straight to today's and this week's totals with one save
+        
+        Test-only shortcut for pushing usage past budget thresholds without
+        recording individual prompts or session entries.
+        """
+        today, week_start = self._day_keys(datetime.now())
+        self._add_to_totals(today, week_start, tokens_used)
+        self.save_usage_data()
+    
     def check_budget_status(self) -> Dict:
         """Check current budget status and generate warnings"""
-        today = datetime.now().date().isoformat()
-        week_start = (datetime.now().date() - timedelta(days=datetime.now().weekday())).isoformat()
+        now = datetime.now()
+        today, week_start = self._day_keys(now)
         
         daily_used = self.usage_data["daily_totals"].get(today, 0)
         weekly_used = self.usage_data["weekly_totals"].get(week_start, 0)
         
+        daily_pct = (daily_used / self.daily_budget) * 100
+        weekly_pct = (weekly_used / self.weekly_budget) * 100
+        
+        # Reuse the last warnings (without re-logging them) while nothing they depend on has changed;
+        # session counters only feed the status dict, which is rebuilt on every call anyway
+        key = (today, week_start, daily_used, weekly_used, self.daily_budget, self.weekly_budget, self._warn_pct)
+        checked_at = time.monotonic()
+        cached = self._budget_cache
+        reuse = cached is not None and cached[0] == key and checked_at - cached[1] < self.BUDGET_STATUS_TTL
+        warnings = list(cached[2]) if reuse else []
+        
+        # Built fresh on every call; callers are free to modify it
         status = {
             "daily": {
                 "used": daily_used,
                 "budget": self.daily_budget,
-                "percentage": (daily_used / self.daily_budget) * 100,
+                "percentage": daily_pct,
                 "remaining": self.daily_budget - daily_used
             },
             "weekly": {
                 "used": weekly_used,
                 "budget": self.weekly_budget,
-                "percentage": (weekly_used / self.weekly_budget) * 100,
+                "percentage": weekly_pct,
                 "remaining": self.weekly_budget - weekly_used
             },
             "session": {
                 "tokens": self.session_tokens,
                 "prompts": self.prompt_counter,
-                "duration_minutes": (datetime.now() - self.session_start).total_seconds() / 60
+                "duration_minutes": (time.monotonic_ns() - self._session_start_ns) / 6e10
             },
-            "warnings": []
+            "warnings": warnings
         }
         
-        # Generate warnings
-        if status["weekly"]["percentage"] > self.warning_threshold * 100:
-            status["warnings"].append(f"⚠️  Weekly budget {status['weekly']['percentage']:.1f}% used ({weekly_used}/{self.weekly_budget} tokens)")
+        if reuse:
+            return status
+        
+        # Generate warnings; messages are only formatted when a threshold is crossed
+        if weekly_pct > self._warn_pct:
+            warnings.append(f"⚠️  Weekly budget {weekly_pct:.1f}% used ({weekly_used}/{self.weekly_budget} tokens)")
         
-        if status["daily"]["percentage"] > 100:
-            status["warnings"].append(f"🔴 Daily budget exceeded: {daily_used}/{self.daily_budget:.1f} tokens")
+        if daily_pct > 100:
+            warnings.append(f"🔴 Daily budget exceeded: {daily_used}/{self.daily_budget:.1f} tokens")
         
-        if status["weekly"]["percentage"] > 100:
-            status["warnings"].append(f"🚨 WEEKLY BUDGET EXCEEDED: {weekly_used}/{self.weekly_budget} tokens")
+        if weekly_pct > 100:
+            warnings.append(f"🚨 WEEKLY BUDGET EXCEEDED: {weekly_used}/{self.weekly_budget} tokens")
         
         # Log warnings
-        for warning in status["warnings"]:
-            self.logger.warning(warning)
+        if warnings and self.logger.isEnabledFor(logging.WARNING):
+            for warning in warnings:
+                self.logger.warning(warning)
         
-        # Log status every 10 prompts
-        self.logger.info(f"Budget Status - Daily: {daily_used:.1f}/{self.daily_budget:.1f} tokens, Weekly: {weekly_used}/{self.weekly_budget} tokens")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Budget Status - Daily: {daily_used:.1f}/{self.daily_budget:.1f} tokens, Weekly: {weekly_used}/{self.weekly_budget} tokens")
         
+        self._budget_cache = (key, checked_at, tuple(warnings))
         return status
     
+    def weekly_remaining_fast(self) -> int:
+        """Tokens left in this week's budget, without building a status or logging"""
+        # A float clock comparison is enough while still inside the cached day
+        day_start, day_end = self._day_span
+        if day_start <= time.time() < day_end:
+            week_start = self._day_keys_cache[1]
+        else:
+            week_start = self._day_keys(datetime.now())[1]
+        return self.weekly_budget - self.usage_data["weekly_totals"].get(week_start, 0)
+    
     def generate_analytics(self) -> Dict:
-        """Generate usage analytics and trends"""
+        """Generate usage analytics and trends
+        
+        Each call returns its own copy, stamped with the time of the call.
+        """
+        if self._analytics_cache is not None:
+            # Nothing recorded since the last run; hand out a copy so callers cannot alter the cache
+            analytics = copy.deepcopy(self._analytics_cache)
+            analytics["generated_at"] = datetime.now().isoformat()
+            return analytics
+        
         analytics = {
             "generated_at": datetime.now().isoformat(),
             "summary": {},
@@ -245,12 +457,13 @@ class TokenUsageTracker:
         }
         
         # Summary statistics
-        total_sessions = len(self.usage_data.get("sessions", []))
+        total_sessions = (len(self.usage_data.get("sessions", []))
+                          + self.usage_data.get("session_archive", {}).get("sessions", 0))
         total_tokens = self.usage_data.get("total_tokens", 0)
         
         if total_sessions > 0:
             avg_tokens_per_session = total_tokens / total_sessions
-            avg_prompts_per_session = sum(s.get("prompt_count", 0) for s in self.usage_data["sessions"]) / total_sessions
+            avg_prompts_per_session = self._total_prompts / total_sessions
         else:
             avg_tokens_per_session = 0
             avg_prompts_per_session = 0
@@ -281,23 +494,11 @@ class TokenUsageTracker:
         
         # Efficiency analysis
         if self.usage_data.get("sessions"):
-            operations = []
-            for session in self.usage_data["sessions"]:
-                operations.extend(session.get("operations", []))
-            
-            # Group by operation type
-            op_stats = {}
-            for op in operations:
-                op_type = op.get("operation", "unknown")
-                if op_type not in op_stats:
-                    op_stats[op_type] = {"count": 0, "total_tokens": 0}
-                
-                op_stats[op_type]["count"] += 1
-                op_stats[op_type]["total_tokens"] += op.get("tokens", 0)
-            
-            # Calculate efficiency
-            for op_type, stats in op_stats.items():
-                stats["avg_tokens"] = round(stats["total_tokens"] / stats["count"], 1)
+            # Per-operation totals are maintained as usage is recorded
+            op_stats = {
+                op_type: {**stats, "avg_tokens": round(stats["total_tokens"] / stats["count"], 1)}
+                for op_type, stats in self._op_stats.items()
+            }
             
             analytics["efficiency"] = {
                 "operations": op_stats,
@@ -318,9 +519,10 @@ class TokenUsageTracker:
             analytics["recommendations"].append("Consider breaking down complex sessions to reduce token usage")
         
         # Save analytics
-        with open(self.analytics_file, 'w') as f:
-            json.dump(analytics, f, indent=2)
+        with open(self.analytics_file, 'wb') as f:
+            dump_json(analytics, f)
         
+        self._analytics_cache = copy.deepcopy(analytics)
         return analytics
     
     def reset_session(self):
@@ -332,6 +534,9 @@ class TokenUsageTracker:
         self.prompt_counter = 0
         self.session_tokens = 0
         self.session_start = datetime.now()
+        self._session_start_ns = time.monotonic_ns()
+        self._session_id = self.session_start.isoformat()
+        self._current_session = None
         self.logger.info("Token tracking session reset")
     
     def get_budget_status_summary(self) -> str:
@@ -11,21 +11,131 @@ Generates YouTube script variations using proven frameworks:
 Usage:
     python3 youtube_script_daily_generator.py
     python3 youtube_script_daily_generator.py --topic "AI automation tools"
-    python3 youtube_script_daily_generator.py --count 5
+    python3 youtube_script_daily_generator.py --count 2
+    python3 youtube_script_daily_generator.py --topics-file topics.txt
 """
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+import functools
+import io
 import json
 import random
+import sys
+
+# Markdown files are written off the calling thread; the executor's worker is
+# joined at interpreter exit, so queued writes always complete
+_WRITER = ThreadPoolExecutor(max_workers=1)
+
+# Fixed markdown fragments repeated for every script variation
+_CALLOUTS_HEADER = """### Visual Callouts
+
+Suggested text overlays for video:
+"""
+_SCRIPT_SEPARATOR = "\n---\n\n"
+
+# Closing section; identical for every document
+_RECOMMENDATIONS_FOOTER = """## Recommendations
+
+### Testing Strategy
+
+1. **A/B Test Hooks:** Try contrarian vs transformation in thumbnails/titles
+2. **Audience Match:**
+   - LinkedIn → Authority or Contrarian
+   - YouTube → Transformation (algorithm-friendly)
+   - Twitter → Contrarian (engagement)
+
+3. **Visual Strategy:** Use specific numbers from authority variation in all thumbnails
+
+### Production Notes
+
+- **Intro:** First 8 seconds = hook only (pattern interrupt)
+- **Pattern Breaks:** Re-hook every 2-3 minutes
+- **B-Roll:** Show specific examples during WHAT section
+- **CTA:** Link to implementation guide/framework in description
+
+### Research Citations
+
+- MIT: Workflow redesign before AI = 2x ROI
+- S&P Global: 95% AI pilot failure rate
+- Stanford: 72% optimistic, 62% lack expertise
+- Microsoft/IDC: $3.50 return per $1 invested
+
+---
+
+**Generated by:** Boring Business AI YouTube Script Generator
+**Next Steps:** Select variation → Record → Edit → Upload
+**Upload to:** https://drive.google.com/drive/folders/1KFTbNaKf44tyIVPknDnzshW-DsrJuxnx
+"""
 
 class YouTubeScriptGenerator:
     """Generate YouTube script variations with proven frameworks"""
 
+    # Variation angles, in the order they are generated
+    _VARIATIONS = ("contrarian", "authority", "transformation")
+
+    # Static script scaffolding, shared by every generated script and never mutated
+    _CONTRARIAN_HOOK = {
+        "pattern_interrupt": "Stop buying AI tools.",
+        "challenge": "95% of AI pilots fail because companies chase features instead of redesigning workflows first.",
+        "promise": "Here's the MIT-backed approach that doubles ROI:"
+    }
+
+    _BODY_WHY_POINTS = (
+        "Why 95% of implementations fail (S&P Global: wrong sequence)",
+        "The compound leverage opportunity most people miss"
+    )
+
+    _BODY_WHAT = {
+        "section": "WHAT actually works",
+        "framework": (
+            "Start with ONE process (not the whole business)",
+            "Map current workflow (before touching AI)",
+            "Identify decision points vs execution steps",
+            "Automate execution, augment decisions",
+            "Measure baseline vs automated performance"
+        ),
+        "example": "Real example: $500M client case study"
+    }
+
+    _BODY_HOW = {
+        "section": "HOW to implement this week",
+        "steps": (
+            "Step 1: Pick your highest-cost manual process",
+            "Step 2: Document current workflow (30 minutes)",
+            "Step 3: Identify automation candidates (pattern recognition tasks)",
+            "Step 4: Build MVP automation (focus on 80% case)",
+            "Step 5: Test, measure, iterate before scaling"
+        ),
+        "closer": "This is how professionals implement AI - not by chasing features, but by redesigning for leverage."
+    }
+
+    # Title formats take the title-cased topic
+    _TITLE_FMT_BY_TYPE = {
+        "contrarian": "Stop Using AI Tools (Do This Instead) | {topic}",
+        "authority": "$500M in Deals Taught Me This About {topic}",
+        "transformation": "How I Automated 87% of {topic} in 30 Days"
+    }
+    _DEFAULT_TITLE_FMT = "{topic} - The Strategic Approach"
+
+    _CALLOUTS_BY_TYPE = {
+        "contrarian": ("95% FAIL", "MIT Research", "2X ROI", "Workflow First"),
+        "authority": ("$500M Analyzed", "47 Companies", "87% Time Saved", "Real M&A Data"),
+        "transformation": ("30 Days", "87% Automated", "$2.4K/mo Saved", "6X Faster")
+    }
+    _DEFAULT_CALLOUTS = ("Key Point", "Framework", "Results")
+
+    _REASONING_BY_TYPE = {
+        "contrarian": "Appeals to sophisticated buyers skeptical of AI hype. Best for LinkedIn and business-focused audiences. Tests contrarian positioning.",
+        "authority": "Builds credibility with specific numbers and M&A experience. Strong for establishing expertise. Works across all platforms.",
+        "transformation": "Algorithm-friendly with clear before/after. Broad appeal. Best for YouTube algorithm and new audience discovery."
+    }
+    _DEFAULT_REASONING = "General purpose variation"
+
     def __init__(self):
-        self.output_dir = Path.home() / "Documents/claudec/active/Social-Content-Generator/pillar_scripts"
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir = self._get_output_dir()
 
         # Authority markers from boring business AI
         self.authority_markers = [
@@ -66,73 +176,69 @@ class YouTubeScriptGenerator:
             }
         }
 
-    def generate_hook(self, topic, variation_type):
-        """Generate a hook using Kallaway's 4-part structure"""
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_output_dir(cls):
+        """Resolve and create the output directory once per process"""
+        output_dir = Path.home() / "Documents/claudec/active/Social-Content-Generator/pillar_scripts"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return output_dir
 
-        hooks = {
-            "contrarian": {
-                "pattern_interrupt": f"Stop buying AI tools.",
-                "challenge": f"95% of AI pilots fail because companies chase features instead of redesigning workflows first.",
-                "promise": f"Here's the MIT-backed approach that doubles ROI:",
-                "credibility": random.choice(self.authority_markers)
-            },
-            "authority": {
-                "authority_statement": random.choice(self.authority_markers),
+    def generate_hook(self, topic, variation_type, marker=None):
+        """Generate a hook using Kallaway's 4-part structure
+
+        marker is the authority marker to use; one is drawn at random if not given.
+        """
+
+        if marker is None:
+            marker = random.choice(self.authority_markers)
+
+        # Only the requested hook is built; unknown types fall back to transformation
+        if variation_type == "contrarian":
+            return {**self._CONTRARIAN_HOOK, "credibility": marker}
+
+        if variation_type == "authority":
+            return {
+                "authority_statement": marker,
                 "specific_experience": f"I've watched companies waste millions on {topic} implementations.",
                 "counter_intuitive": "The ones that succeeded did the opposite of what every AI vendor recommends.",
                 "meaning": "And it comes down to one simple principle..."
-            },
-            "transformation": {
-                "current_pain": f"Most businesses struggle with {topic} because they start with the wrong question.",
-                "desired_outcome": f"What if you could automate 87% of the process in under 30 days?",
-                "specific_result": "$2,400/month saved, 6x time reduction, measurable ROI.",
-                "proof": f"{random.choice(self.authority_markers)} - here's the exact framework."
             }
+
+        return {
+            "current_pain": f"Most businesses struggle with {topic} because they start with the wrong question.",
+            "desired_outcome": "What if you could automate 87% of the process in under 30 days?",
+            "specific_result": "$2,400/month saved, 6x time reduction, measurable ROI.",
+            "proof": f"{marker} - here's the exact framework."
         }
 
-        return hooks.get(variation_type, hooks["transformation"])
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def generate_body_why_what_how(topic):
+        """Generate WHY-WHAT-HOW body structure
 
-    def generate_body_why_what_how(self, topic):
-        """Generate WHY-WHAT-HOW body structure"""
+        Depends only on the topic, so every variation of a topic shares one
+        (read-only) body.
+        """
 
+        # Only the first WHY point depends on the topic; WHAT and HOW are shared
         return {
             "why": {
                 "section": "WHY this matters",
-                "points": [
+                "points": (
                     f"The business case for {topic} (MIT: workflow redesign first = 2x ROI)",
-                    "Why 95% of implementations fail (S&P Global: wrong sequence)",
-                    f"The compound leverage opportunity most people miss"
-                ],
+                    *YouTubeScriptGenerator._BODY_WHY_POINTS
+                ),
                 "pattern_break": "But here's what nobody tells you..."
             },
-            "what": {
-                "section": "WHAT actually works",
-                "framework": [
-                    "Start with ONE process (not the whole business)",
-                    "Map current workflow (before touching AI)",
-                    "Identify decision points vs execution steps",
-                    "Automate execution, augment decisions",
-                    "Measure baseline vs automated performance"
-                ],
-                "example": f"Real example: $500M client case study"
-            },
-            "how": {
-                "section": "HOW to implement this week",
-                "steps": [
-                    "Step 1: Pick your highest-cost manual process",
-                    "Step 2: Document current workflow (30 minutes)",
-                    "Step 3: Identify automation candidates (pattern recognition tasks)",
-                    "Step 4: Build MVP automation (focus on 80% case)",
-                    "Step 5: Test, measure, iterate before scaling"
-                ],
-                "closer": "This is how professionals implement AI - not by chasing features, but by redesigning for leverage."
-            }
+            "what": YouTubeScriptGenerator._BODY_WHAT,
+            "how": YouTubeScriptGenerator._BODY_HOW
         }
 
-    def generate_script_variation(self, topic, variation_type, index):
+    def generate_script_variation(self, topic, variation_type, index, marker=None):
         """Generate complete script with hook + body"""
 
-        hook = self.generate_hook(topic, variation_type)
+        hook = self.generate_hook(topic, variation_type, marker)
         body = self.generate_body_why_what_how(topic)
 
         script = {
@@ -151,53 +257,61 @@ class YouTubeScriptGenerator:
     def generate_title(self, topic, variation_type):
         """Generate YouTube title based on variation type"""
 
-        titles = {
-            "contrarian": f"Stop Using AI Tools (Do This Instead) | {topic.title()}",
-            "authority": f"$500M in Deals Taught Me This About {topic.title()}",
-            "transformation": f"How I Automated 87% of {topic.title()} in 30 Days"
-        }
-
-        return titles.get(variation_type, f"{topic.title()} - The Strategic Approach")
+        try:
+            title_fmt = self._TITLE_FMT_BY_TYPE[variation_type]
+        except KeyError:
+            title_fmt = self._DEFAULT_TITLE_FMT
+        return title_fmt.format(topic=topic.title())
 
     def generate_visual_callouts(self, variation_type):
         """Suggest visual text overlays"""
 
-        callouts = {
-            "contrarian": ["95% FAIL", "MIT Research", "2X ROI", "Workflow First"],
-            "authority": ["$500M Analyzed", "47 Companies", "87% Time Saved", "Real M&A Data"],
-            "transformation": ["30 Days", "87% Automated", "$2.4K/mo Saved", "6X Faster"]
-        }
-
-        return callouts.get(variation_type, ["Key Point", "Framework", "Results"])
+        try:
+            return self._CALLOUTS_BY_TYPE[variation_type]
+        except KeyError:
+            return self._DEFAULT_CALLOUTS
 
     def get_strategic_reasoning(self, variation_type):
         """Explain when to use each variation"""
 
-        reasoning = {
-            "contrarian": "Appeals to sophisticated buyers skeptical of AI hype. Best for LinkedIn and business-focused audiences. Tests contrarian positioning.",
-            "authority": "Builds credibility with specific numbers and M&A experience. Strong for establishing expertise. Works across all platforms.",
-            "transformation": "Algorithm-friendly with clear before/after. Broad appeal. Best for YouTube algorithm and new audience discovery."
-        }
+        try:
+            return self._REASONING_BY_TYPE[variation_type]
+        except KeyError:
+            return self._DEFAULT_REASONING
+
+    def format_markdown_output(self, scripts, topic, generated=None):
+        """Format scripts as markdown for saving, stamped with generated (default: now)"""
 
-        return reasoning.get(variation_type, "General purpose variation")
+        buffer = io.StringIO()
+        self.write_markdown(scripts, topic, buffer, generated)
+        return buffer.getvalue()
 
-    def format_markdown_output(self, scripts, topic):
-        """Format scripts as markdown for saving"""
+    def write_markdown(self, scripts, topic, fp, generated=None):
+        """Write the scripts' markdown to the text file fp piece by piece"""
 
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        if generated is None:
+            generated = datetime.now()
 
-        markdown = f"""# YouTube Script Variations - {topic.title()}
+        write = fp.write
+        writelines = fp.writelines
 
-**Generated:** {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
+        write(f"""# YouTube Script Variations - {topic.title()}
+
+**Generated:** {generated.strftime("%B %d, %Y at %I:%M %p")}
 **Topic:** {topic}
 **Variations:** {len(scripts)}
 
 ---
 
-"""
+""")
 
         for script in scripts:
-            markdown += f"""## Variation {script['variation']}: {script['type'].title()} Angle
+            body = script['body']
+            why = body['why']
+            what = body['what']
+            how = body['how']
+
+            write(f"""## Variation {script['variation']}: {script['type'].title()} Angle
 
 **Title:** {script['title']}
 
@@ -205,138 +319,137 @@ class YouTubeScriptGenerator:
 
 ### Hook (Kallaway's 4-Part Structure)
 
-"""
-            for key, value in script['hook'].items():
-                markdown += f"**{key.replace('_', ' ').title()}:** {value}\n\n"
+""")
+            writelines(f"**{key.replace('_', ' ').title()}:** {value}\n\n" for key, value in script['hook'].items())
 
-            markdown += f"""
+            write(f"""
 ### Body: WHY-WHAT-HOW Framework
 
-#### WHY {script['body']['why']['section']}
+#### WHY {why['section']}
 
-"""
-            for point in script['body']['why']['points']:
-                markdown += f"- {point}\n"
+""")
+            writelines(f"- {point}\n" for point in why['points'])
 
-            markdown += f"\n**Pattern Break:** {script['body']['why']['pattern_break']}\n\n"
+            write(f"\n**Pattern Break:** {why['pattern_break']}\n\n")
 
-            markdown += f"""#### WHAT {script['body']['what']['section']}
+            write(f"""#### WHAT {what['section']}
 
 **Framework:**
-"""
-            for step in script['body']['what']['framework']:
-                markdown += f"1. {step}\n"
+""")
+            writelines(f"1. {step}\n" for step in what['framework'])
 
-            markdown += f"\n**Example:** {script['body']['what']['example']}\n\n"
+            write(f"\n**Example:** {what['example']}\n\n")
 
-            markdown += f"""#### HOW {script['body']['how']['section']}
+            write(f"""#### HOW {how['section']}
 
-"""
-            for step in script['body']['how']['steps']:
-                markdown += f"{step}\n"
-
-            markdown += f"\n**Closer:** {script['body']['how']['closer']}\n\n"
+""")
+            writelines(f"{step}\n" for step in how['steps'])
 
-            markdown += f"""### Visual Callouts
+            write(f"\n**Closer:** {how['closer']}\n\n")
 
-Suggested text overlays for video:
-"""
-            for callout in script['visual_callouts']:
-                markdown += f"- `{callout}`\n"
+            write(_CALLOUTS_HEADER)
+            writelines(f"- `{callout}`\n" for callout in script['visual_callouts'])
 
-            markdown += "\n---\n\n"
+            write(_SCRIPT_SEPARATOR)
 
         # Add recommendations section
-        markdown += f"""## Recommendations
-
-### Testing Strategy
-
-1. **A/B Test Hooks:** Try contrarian vs transformation in thumbnails/titles
-2. **Audience Match:**
-   - LinkedIn → Authority or Contrarian
-   - YouTube → Transformation (algorithm-friendly)
-   - Twitter → Contrarian (engagement)
+        write(_RECOMMENDATIONS_FOOTER)
 
-3. **Visual Strategy:** Use specific numbers from authority variation in all thumbnails
+    def _write_markdown_file(self, output_path, scripts, topic, generated):
+        """Stream the scripts' markdown straight into output_path and return how many were written"""
 
-### Production Notes
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 16) as fp:
+            self.write_markdown(scripts, topic, fp, generated)
+        return len(scripts)
 
-- **Intro:** First 8 seconds = hook only (pattern interrupt)
-- **Pattern Breaks:** Re-hook every 2-3 minutes
-- **B-Roll:** Show specific examples during WHAT section
-- **CTA:** Link to implementation guide/framework in description
+    def generate_daily_scripts(self, topic=None, count=3, quiet=False):
+        """Generate daily YouTube script variations
 
-### Research Citations
-
-- MIT: Workflow redesign before AI = 2x ROI
-- S&P Global: 95% AI pilot failure rate
-- Stanford: 72% optimistic, 62% lack expertise
-- Microsoft/IDC: $3.50 return per $1 invested
-
----
-
-**Generated by:** Boring Business AI YouTube Script Generator
-**Next Steps:** Select variation → Record → Edit → Upload
-**Upload to:** https://drive.google.com/drive/folders/1KFTbNaKf44tyIVPknDnzshW-DsrJuxnx
-"""
-
-        return markdown
-
-    def generate_daily_scripts(self, topic=None, count=3):
-        """Generate daily YouTube script variations"""
+        Returns (output_path, future) rather than just output_path: the markdown
+        is written in the background, and future.result() waits for the write,
+        re-raises any error from it and returns the number of variations written.
+        The progress report is written to stdout in one go unless quiet is set;
+        report_saved() prints the success summary once the write has resolved.
+        """
 
         if topic is None:
             topic = random.choice(self.topic_pool)
 
-        print(f"\n{'='*80}")
-        print(f"📹 YouTube Script Generator")
-        print(f"{'='*80}\n")
-        print(f"Topic: {topic}")
-        print(f"Variations: {count}\n")
+        status = [
+            f"\n{'='*80}",
+            "📹 YouTube Script Generator",
+            f"{'='*80}\n",
+            f"Topic: {topic}",
+            f"Variations: {count}\n"
+        ]
 
-        variations = ["contrarian", "authority", "transformation"]
+        variations = self._VARIATIONS[:count] if count > 0 else ()
         scripts = []
 
-        for i in range(min(count, len(variations))):
-            variation_type = variations[i]
-            print(f"Generating variation {i+1}/{count}: {variation_type.title()} angle...")
+        # One draw for every variation's authority marker
+        markers = random.choices(self.authority_markers, k=len(variations))
 
-            script = self.generate_script_variation(topic, variation_type, i)
+        for i, variation_type in enumerate(variations):
+            status.append(f"Generating variation {i+1}/{count}: {variation_type.title()} angle...")
+
+            script = self.generate_script_variation(topic, variation_type, i, markers[i])
             scripts.append(script)
 
         # Save to markdown
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        # One clock read for both the filename date and the document timestamp
+        generated = datetime.now()
+        date_str = generated.date().isoformat()
         safe_topic = topic.lower().replace(" ", "_").replace("/", "_")[:50]
         filename = f"youtube_scripts_{date_str}_{safe_topic}.md"
         output_path = self.output_dir / filename
 
-        markdown_content = self.format_markdown_output(scripts, topic)
+        # Rendered on the writer thread directly into the file; no full copy in memory
+        future = _WRITER.submit(self._write_markdown_file, output_path, scripts, topic, generated)
+
+        if not quiet:
+            status.append(f"\n📝 Writing to: {output_path}")
+            sys.stdout.write("\n".join(status) + "\n")
 
-        with open(output_path, 'w') as f:
-            f.write(markdown_content)
+        return output_path, future
 
-        print(f"\n✅ Scripts generated successfully!")
-        print(f"📁 Saved to: {output_path}")
-        print(f"📊 {len(scripts)} variations created")
-        print(f"\n💡 Next steps:")
-        print(f"   1. Review scripts in: {output_path.name}")
-        print(f"   2. Select variation based on audience/platform")
-        print(f"   3. Record using selected hook + body structure")
-        print(f"   4. Add visual callouts during editing")
-        print(f"   5. Upload to Google Drive: https://drive.google.com/drive/folders/1KFTbNaKf44tyIVPknDnzshW-DsrJuxnx")
+    def report_saved(self, output_path, variation_count):
+        """Print the success summary for a script file whose write has completed"""
 
-        return output_path
+        sys.stdout.write("\n".join([
+            "\n✅ Scripts generated successfully!",
+            f"📁 Saved to: {output_path}",
+            f"📊 {variation_count} variations created",
+            "\n💡 Next steps:",
+            f"   1. Review scripts in: {output_path.name}",
+            "   2. Select variation based on audience/platform",
+            "   3. Record using selected hook + body structure",
+            "   4. Add visual callouts during editing",
+            "   5. Upload to Google Drive: https://drive.google.com/drive/folders/1KFTbNaKf44tyIVPknDnzshW-DsrJuxnx"
+        ]) + "\n")
 
 
 def main():
     parser = argparse.ArgumentParser(description='Generate daily YouTube script variations')
     parser.add_argument('--topic', type=str, help='Specific topic to generate scripts for')
-    parser.add_argument('--count', type=int, default=3, help='Number of variations (1-3)')
+    parser.add_argument('--count', type=int, default=3, choices=[1, 2, 3], help='Number of variations (1-3)')
+    parser.add_argument('--topics-file', type=Path, help='File with one topic per line to generate scripts for in one run')
+    parser.add_argument('--quiet', action='store_true', help='Suppress the status report')
 
     args = parser.parse_args()
 
+    if args.topics_file:
+        topics = [line.strip() for line in args.topics_file.read_text(encoding='utf-8').splitlines() if line.strip()]
+    else:
+        topics = [args.topic]
+
+    # Each file write overlaps with generating the next topic
     generator = YouTubeScriptGenerator()
-    generator.generate_daily_scripts(topic=args.topic, count=args.count)
+    pending_writes = [generator.generate_daily_scripts(topic=topic, count=args.count, quiet=args.quiet) for topic in topics]
+    for output_path, pending_write in pending_writes:
+        # Only report success once the file is actually on disk
+        variation_count = pending_write.result()
+        if not args.quiet:
+            generator.report_saved(output_path, variation_count)
 
 
 if __name__ == "__main__":